@@ -1,3 +1,4 @@
+import mmap
 import pytest
 import re
 from math import prod
@@ -17,6 +18,14 @@ APPROACH:
 		`do` and `don't` will switch on/off whether to include subsequent
 		`mul`s. The flag starts at enabled. 
 		Only count the `mul`s when the flag is enabled. 
+
+	Streaming mode:
+		Rather than reading the whole dump in as one string, memory-map the file and scan it in 
+		fixed-size chunks of bytes, so memory use stays flat regardless of the size of the dump.
+		An operator can straddle the boundary between two chunks, so the tail end of each chunk 
+		(after the last match) is carried over to the front of the next one. An operator can never 
+		be longer than `mul(123,456)`, so only that many bytes minus one ever needs carrying.
+		The enabled/disabled flag simply carries on between chunks as with the whole string.
 '''
 
 def Parse(inputFile):
@@ -24,16 +33,50 @@ def Parse(inputFile):
 	with open(inputFile) as inFile:
 		return inFile.read().strip()
 
-def Solve(inputFile, toggle = False):
-	# Regex to capture relevant operators from raw data.
-	opRegex = re.compile(r"(mul|do|don't)\((?:(\d{1,3}),(\d{1,3})){0,1}\)")
+# Regex to capture relevant operators from raw data.
+OP_PATTERN = r"(mul|do|don't)\((?:(\d{1,3}),(\d{1,3})){0,1}\)"
+
+# The longest an operator can be: `mul(123,456)`.
+MAX_OP_LENGTH = len("mul(123,456)")
+
+def StreamOperations(inputFile, chunkSize):
+	# Same regex as the string version, but matching on bytes straight from the mapped file.
+	opRegex = re.compile(OP_PATTERN.encode())
+
+	with open(inputFile, "rb") as inFile:
+		# mmap refuses to map an empty file, but then an empty file has nothing to find anyway.
+		if inFile.seek(0, 2) == 0:
+			return
+
+		with mmap.mmap(inFile.fileno(), 0, access = mmap.ACCESS_READ) as memory:
+			carry = b""
+			for offset in range(0, len(memory), chunkSize):
+				chunk = carry + memory[offset:offset + chunkSize]
+
+				lastEnd = 0
+				for match in opRegex.finditer(chunk):
+					lastEnd = match.end()
+
+					# Operators are always ASCII, so only the name needs decoding for comparisons.
+					# int() is happy to take the values as bytes.
+					yield match.group(1).decode(), match.group(2), match.group(3)
+
+				# Carry over anything after the last match that could be the start of an operator 
+				# cut off by the end of the chunk. Anything before that can't be part of one.
+				carry = chunk[max(lastEnd, len(chunk) - (MAX_OP_LENGTH - 1)):]
+
+def Solve(inputFile, toggle = False, chunkSize = None):
+	if chunkSize is None:
+		opRegex = re.compile(OP_PATTERN)
+		operations = (match.groups() for match in opRegex.finditer(Parse(inputFile)))
+	else:
+		operations = StreamOperations(inputFile, chunkSize)
 
 	result = 0		# Running total for final result.
 
 	active = True	# Flag to determine whether to cuunt a `mul`.
-	for match in opRegex.finditer(Parse(inputFile)):
+	for op, *values in operations:
 		# `mul`s will have two values, `do` and `don't` none.
-		op, *values = match.groups()
 
 		if op == "don't":
 			# Stop counting `mul`s, but ONLY is in Part 2.
@@ -60,8 +103,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert Solve(inputPath) == expected
+@pytest.mark.parametrize("chunkSize", [None, 1 << 20])
+def test_part_a(inputPath, expected, chunkSize):
+	assert Solve(inputPath, chunkSize = chunkSize) == expected
 
 testCases = [
 	("examples/Day03_ExampleB.txt", 48),
@@ -69,8 +113,15 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert Solve(inputPath, toggle = True) == expected
+@pytest.mark.parametrize("chunkSize", [None, 1 << 20])
+def test_part_b(inputPath, expected, chunkSize):
+	assert Solve(inputPath, toggle = True, chunkSize = chunkSize) == expected
+
+# Tiny chunks guarantee operators get split across chunk boundaries at every possible point.
+@pytest.mark.parametrize("chunkSize", range(1, MAX_OP_LENGTH + 2))
+def test_chunk_boundaries(chunkSize):
+	assert Solve("examples/Day03_ExampleA.txt", chunkSize = chunkSize) == 161
+	assert Solve("examples/Day03_ExampleB.txt", toggle = True, chunkSize = chunkSize) == 48
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
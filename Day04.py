@@ -64,11 +64,86 @@ def FindOccurances(grid, phrase):
 				if GetPhrase(grid, (x, y), direction, len(phrase)) == phrase:
 					yield (x, y), (x + direction[0] * numSteps, y + direction[1] * numSteps)
 
-def PartA(inputFile):
+def ParseMasks(inputFile):
+	# Rather than a list of strings, the grid is kept as one flat block of bytes with each row 
+	# followed by a newline. Moving by (x, y) is then moving by x + y * stride, and the newlines 
+	# act as a one-column gutter that stops words wrapping around from one row to the next.
+	with open(inputFile, "rb") as inFile:
+		grid = inFile.read().replace(b"\r", b"").strip() + b"\n"
+
+	stride = grid.index(b"\n") + 1
+
+	# For each letter, convert the grid into a mask with a 1 byte where that letter is and 0 
+	# elsewhere, then read that back as one big integer. Each cell becomes its own 8-bit lane, 
+	# so ANDing the masks compares every cell in the grid at once.
+	masks = {}
+	for letter in set(grid) - set(b"\n"):
+		table = bytearray(256)
+		table[letter] = 1
+
+		masks[chr(letter)] = int.from_bytes(grid.translate(table), "little")
+
+	return stride, masks
+
+def ShiftMask(mask, offset):
+	# Moves the lane for the cell at (position + offset) down to (position). Lanes that would come 
+	# from outside the grid are shifted in as zeroes, so they can never match.
+	if offset >= 0:
+		return mask >> (offset * 8)
+	
+	return mask << (-offset * 8)
+
+def CountPhrases(stride, masks, phrase):
+	count = 0
+
+	for dy in (-1, 0, 1):
+		for dx in (-1, 0, 1):
+			if dx == dy == 0:
+				continue
+
+			# Start from every cell, then knock out any where the next letter along doesn't match.
+			offset = dx + dy * stride
+			matches = -1
+			for i, letter in enumerate(phrase):
+				matches &= ShiftMask(masks.get(letter, 0), offset * i)
+
+			count += matches.bit_count()
+
+	return count
+
+def CountCrosses(stride, masks, phrase):
+	# Only works for phrases with a middle letter to cross over.
+	assert len(phrase) == 3
+
+	first, middle, last = (masks.get(letter, 0) for letter in phrase)
+
+	# Either diagonal through the middle letter can read forwards or backwards.
+	crosses = middle
+	for corner in (-stride - 1, -stride + 1):
+		forwards = ShiftMask(first, corner) & ShiftMask(last, -corner)
+		backwards = ShiftMask(last, corner) & ShiftMask(first, -corner)
+
+		crosses &= forwards | backwards
+
+	return crosses.bit_count()
+
+def SearchGrid(inputFile):
+	# Answers both parts from a single parse of the grid.
+	stride, masks = ParseMasks(inputFile)
+
+	return CountPhrases(stride, masks, "XMAS"), CountCrosses(stride, masks, "MAS")
+
+def PartA(inputFile, vectorised = False):
+	if vectorised:
+		return CountPhrases(*ParseMasks(inputFile), "XMAS")
+
 	# This way is used over len() to avoid having to resolve the entire iterator in one go.
 	return sum(1 for _ in FindOccurances(Parse(inputFile), "XMAS"))
 
-def PartB(inputFile):
+def PartB(inputFile, vectorised = False):
+	if vectorised:
+		return CountCrosses(*ParseMasks(inputFile), "MAS")
+
 	grid = Parse(inputFile)
 
 	# Forwards & backwards
@@ -95,8 +170,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert PartA(inputPath) == expected
+@pytest.mark.parametrize("vectorised", [False, True])
+def test_part_a(inputPath, expected, vectorised):
+	assert PartA(inputPath, vectorised = vectorised) == expected
 
 testCases = [
 	("examples/Day04_ExampleB.txt", 9),
@@ -104,8 +180,12 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert PartB(inputPath) == expected
+@pytest.mark.parametrize("vectorised", [False, True])
+def test_part_b(inputPath, expected, vectorised):
+	assert PartB(inputPath, vectorised = vectorised) == expected
+
+def test_search_grid():
+	assert SearchGrid("examples/Day04_ExampleB.txt") == (18, 9)
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
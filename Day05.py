@@ -1,5 +1,8 @@
 import pytest
-from functools import cmp_to_key
+from collections import deque
+from functools import cmp_to_key, reduce
+from itertools import pairwise, repeat
+from operator import and_, or_
 
 def Parse(inputFile):
 	with open(inputFile) as inFile:
@@ -22,7 +25,87 @@ def EvaluateUpdate(line, groupings):
 
 	return line[int(len(line) / 2)]
 
-def Solve(inputFile, fixIncorrects = False):
+def IndexRules(dependencies):
+	# Built once per rule set, then shared by every update checked against it.
+	index = {
+		"after": {},		# Page -> pages that must come after it.
+		"before": {},		# Page -> pages that must come before it.
+		"bits": {},			# Page -> a unique bit, for building sets of pages as integers.
+		"beforeMasks": {}	# Page -> "before" as a bitmask.
+	}
+
+	for a, b in sorted(dependencies):
+		index["after"].setdefault(a, set()).add(b)
+		index["before"].setdefault(b, set()).add(a)
+
+	for i, page in enumerate(index["after"].keys() | index["before"].keys()):
+		index["bits"][page] = 1 << i
+
+	for page, before in index["before"].items():
+		index["beforeMasks"][page] = sum(index["bits"][p] for p in before)
+
+	return index
+
+def IsUpdateOrdered(update, index):
+	# The rules cover every pair of pages in an update, so if each page is allowed directly before
+	# the next one, the whole update is in order. No need to compare every pair.
+	after = index["after"]
+	return all(b in after.get(a, ()) for a, b in pairwise(update))
+
+def RepairUpdate(update, index):
+	# Only rules between pages that are actually present in the update matter. 
+	# Checking a page's rules against the pages present is done with bitmasks (one bit per page) 
+	# rather than set intersections, so each check is a single AND & popcount.
+	present = reduce(or_, map(index["bits"].get, update, repeat(0)))
+	beforeMasks = map(and_, map(index["beforeMasks"].get, update, repeat(0)), repeat(present))
+	numBlockers = dict(zip(update, map(int.bit_count, beforeMasks)))
+
+	# Normally there's a rule for every pair of pages, so the number of pages that have to come 
+	# before a page is exactly where it belongs. Those can be dropped straight into place.
+	if len(set(numBlockers.values())) == len(update):
+		repaired = [None] * len(update)
+		for page, rank in numBlockers.items():
+			repaired[rank] = page
+
+		return repaired
+
+	# Otherwise, fall back on a full topological sort (Kahn's algorithm).
+	present = set(update)
+	ready = deque(p for p in update if numBlockers[p] == 0)
+
+	repaired = []
+	while ready:
+		page = ready.popleft()
+		repaired.append(page)
+
+		for nextPage in index["after"].get(page, set()) & present:
+			numBlockers[nextPage] -= 1
+			if numBlockers[nextPage] == 0:
+				ready.append(nextPage)
+
+	# If any pages never became unblocked, the rules contradict each other for this update.
+	assert len(repaired) == len(update)
+
+	return repaired
+
+def SolveIndexed(inputFile, fixIncorrects = False):
+	dependencies, updates = Parse(inputFile)
+	index = IndexRules(dependencies)
+
+	result = 0
+	for update in updates:
+		if IsUpdateOrdered(update, index):
+			if not fixIncorrects:
+				result += update[len(update) // 2]
+		elif fixIncorrects:
+			result += RepairUpdate(update, index)[len(update) // 2]
+
+	return result
+
+def Solve(inputFile, fixIncorrects = False, indexed = False):
+	if indexed:
+		return SolveIndexed(inputFile, fixIncorrects)
+
 	dependencies, updates = Parse(inputFile)
 
 	result = 0
@@ -40,8 +123,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert Solve(inputPath) == expected
+@pytest.mark.parametrize("indexed", [False, True])
+def test_part_a(inputPath, expected, indexed):
+	assert Solve(inputPath, indexed = indexed) == expected
 
 testCases = [
 	("examples/Day05_Example.txt", 123),
@@ -49,8 +133,14 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert Solve(inputPath, fixIncorrects = True) == expected
+@pytest.mark.parametrize("indexed", [False, True])
+def test_part_b(inputPath, expected, indexed):
+	assert Solve(inputPath, fixIncorrects = True, indexed = indexed) == expected
+
+def test_repair_page_zero():
+	# Missing rules force the topological sort, and page 0 is left on its own at the end of the queue.
+	repaired = RepairUpdate([7, 5, 0], IndexRules({(0, 7), (5, 7)}))
+	assert sorted(repaired) == [0, 5, 7] and repaired[-1] == 7
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
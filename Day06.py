@@ -1,4 +1,6 @@
 import pytest
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 
 def Parse(inputFile):
 	obstacles = set()
@@ -50,7 +52,165 @@ def RunSimulation(size, startingPosition, obstacles):
 
 	return isLoop, set(visited.keys())
 
-def Solve(inputFile, interfere = False):
+# Directions in the order the guard turns through them: Up, right, down, left.
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+def BuildJumpTables(obstacles):
+	# For each row, the sorted x positions of its obstacles. Likewise for each column with y.
+	# This lets the guard find the next obstacle in its path with a binary search, rather than 
+	# walking there one tile at a time.
+	rows = {}
+	columns = {}
+
+	for x, y in sorted(obstacles):
+		rows.setdefault(y, []).append(x)
+		columns.setdefault(x, []).append(y)
+
+	for row in rows.values():
+		row.sort()
+
+	return rows, columns
+
+def FindNextStop(tables, size, position, directionIdx, extraObstacle = None):
+	rows, columns = tables
+	x, y = position
+	dx, dy = DIRECTIONS[directionIdx]
+
+	# Flatten the move down to one dimension: Which line the guard is moving along, where it is on 
+	# that line and which way it's heading.  
+	extra = None
+	if dx == 0:
+		line, along, step, limit = columns.get(x, []), y, dy, size[1]
+		if extraObstacle is not None and extraObstacle[0] == x:
+			extra = extraObstacle[1]
+	else:
+		line, along, step, limit = rows.get(y, []), x, dx, size[0]
+		if extraObstacle is not None and extraObstacle[1] == y:
+			extra = extraObstacle[0]
+
+	# Find the nearest obstacle ahead of the guard. The extra obstacle isn't in the tables (so 
+	# they never need rebuilding), so check whether it's any closer separately.
+	blocker = None
+	if step < 0:
+		i = bisect_left(line, along) - 1
+		if i >= 0:
+			blocker = line[i]
+		if extra is not None and extra < along and (blocker is None or extra > blocker):
+			blocker = extra
+	else:
+		i = bisect_right(line, along)
+		if i < len(line):
+			blocker = line[i]
+		if extra is not None and extra > along and (blocker is None or extra < blocker):
+			blocker = extra
+
+	# Nothing in the way: The guard walks straight off the edge of the map.
+	if blocker is None:
+		edge = 0
+		if step > 0:
+			edge = limit - 1
+
+		return (dx == 0 and (x, edge) or (edge, y)), True
+
+	# Otherwise, stop right in front of the obstacle.
+	stop = blocker - step
+	return (dx == 0 and (x, stop) or (stop, y)), False
+
+def RunJumpSimulation(tables, size, startingPosition, directionIdx = 0, extraObstacle = None):
+	# Same as RunSimulation(), but the guard jumps from obstacle to obstacle. Returns whether the 
+	# guard got stuck in a loop, and the positions it stopped at along the way.
+	position = startingPosition
+	stops = [(position, directionIdx)]
+
+	# The guard only changes direction at an obstacle, so it's enough to only track those spots 
+	# (with the direction faced) for spotting a loop.  
+	turns = set()
+	while True:
+		position, exited = FindNextStop(tables, size, position, directionIdx, extraObstacle)
+		if exited:
+			stops.append((position, directionIdx))
+			return False, stops
+
+		directionIdx = (directionIdx + 1) % 4
+		stops.append((position, directionIdx))
+
+		if (position, directionIdx) in turns:
+			return True, stops
+
+		turns.add((position, directionIdx))
+
+def GetVisitedTiles(stops):
+	# Fill in every tile along the straight lines between the stops.
+	visited = set()
+
+	for (a, _), (b, _) in zip(stops, stops[1:]):
+		if a[0] == b[0]:
+			step = b[1] >= a[1] and 1 or -1
+			visited.update((a[0], y) for y in range(a[1], b[1] + step, step))
+		else:
+			step = b[0] >= a[0] and 1 or -1
+			visited.update((x, a[1]) for x in range(a[0], b[0] + step, step))
+
+	return visited
+
+def FindResumePoints(stops):
+	# For each tile on the guard's path, find where the guard was (and which way it was facing) when 
+	# it set off along the line that first reached that tile. Everything before that point plays 
+	# out the same with or without an obstacle on the tile, so a run testing that tile can skip 
+	# straight to it. 
+	resumePoints = {}
+
+	for (a, directionIdx), (b, _) in zip(stops, stops[1:]):
+		dx, dy = DIRECTIONS[directionIdx]
+
+		# The tile the guard starts a line on was already reached by the line before it.
+		numTiles = abs(b[0] - a[0]) + abs(b[1] - a[1])
+		for i in range(1, numTiles + 1):
+			resumePoints.setdefault((a[0] + dx * i, a[1] + dy * i), (a, directionIdx))
+
+	return resumePoints
+
+def CountLoopingCandidates(tables, size, candidates):
+	# candidates is a list of (tile, (resume position, resume direction)).
+	# Kept as a top-level function so that it can be handed off to worker processes.
+	return sum(
+		RunJumpSimulation(tables, size, position, directionIdx, extraObstacle = coord)[0] 
+		for coord, (position, directionIdx) in candidates
+	)
+
+def SolveJumping(inputFile, interfere = False, workers = None):
+	guard_position, size, obstacles = Parse(inputFile)
+	tables = BuildJumpTables(obstacles)
+
+	_, stops = RunJumpSimulation(tables, size, guard_position)
+	
+	if not interfere:
+		return len(GetVisitedTiles(stops))
+
+	# Each candidate is tried as an extra obstacle on top of the same tables, starting from just 
+	# before the guard would first walk into it.
+	candidates = FindResumePoints(stops)
+	candidates.pop(guard_position, None)
+	candidates = list(candidates.items())
+
+	if workers is None:
+		return CountLoopingCandidates(tables, size, candidates)
+
+	# Some candidates take far longer than others, so they're dealt out in plenty of small batches 
+	# rather than one per worker. That way, a worker that finishes early can pick up more.
+	batchSize = max(1, len(candidates) // (workers * 16))
+	batches = [candidates[i:i + batchSize] for i in range(0, len(candidates), batchSize)]
+
+	with ProcessPoolExecutor(max_workers = workers) as executor:
+		futures = [executor.submit(CountLoopingCandidates, tables, size, batch) for batch in batches]
+
+		return sum(f.result() for f in futures)
+
+def Solve(inputFile, interfere = False, jumping = False, workers = None):
+	# Spreading the work over multiple processes is only supported by the jumping simulation.
+	if jumping or workers is not None:
+		return SolveJumping(inputFile, interfere, workers)
+
 	guard_position, size, obstacles = Parse(inputFile)
 
 	# An extra obstacle would only have an effect on spots the guard would visit naturally.
@@ -75,8 +235,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert Solve(inputPath) == expected
+@pytest.mark.parametrize("jumping", [False, True])
+def test_part_a(inputPath, expected, jumping):
+	assert Solve(inputPath, jumping = jumping) == expected
 
 testCases = [
 	("examples/Day06_Example.txt", 6),
@@ -84,8 +245,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert Solve(inputPath, interfere = True) == expected
+@pytest.mark.parametrize("jumping, workers", [(False, None), (True, None), (True, 2)])
+def test_part_b(inputPath, expected, jumping, workers):
+	assert Solve(inputPath, interfere = True, jumping = jumping, workers = workers) == expected
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
@@ -1,12 +1,29 @@
 import pytest
-from itertools import product
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import batched, product
+
+def ParseLine(line):
+	key, _, values = line.strip().partition(": ")
+
+	return int(key), [int(v) for v in values.split(" ")]
 
 def Parse(inputFile):
 	with open(inputFile) as inFile:
 		for line in inFile.readlines():
-			key, _, values = line.strip().partition(": ")
+			yield ParseLine(line)
+
+def NextPowerOfTen(value):
+	# The smallest power of ten above value, i.e. 10 ^ (number of digits in value). 
+	# Done with integers alone: No string conversion, and no float rounding for huge values.
+	power = 10
+	while power <= value:
+		power *= 10
 
-			yield int(key), [int(v) for v in values.split(" ")]
+	return power
+
+def Concatenate(a, b):
+	# Arithmetic equivalent of int(f"{a}{b}"): Shift a left by the number of digits in b.
+	return a * NextPowerOfTen(b) + b
 
 def Evaluate(values, targetValue, concatenate):
 	operators = "+*"
@@ -22,7 +39,7 @@ def Evaluate(values, targetValue, concatenate):
 			elif operation == "*":
 				result *= nextValue
 			elif operation == "|":
-				result = int(f"{result}{nextValue}")
+				result = Concatenate(result, nextValue)
 			else:
 				raise Exception("Unexpected")
 		
@@ -31,8 +48,81 @@ def Evaluate(values, targetValue, concatenate):
 
 	return False
 
-def Solve(inputFile, concatenate = False):
-	return sum(key for key, values in Parse(inputFile) if Evaluate(values, key, concatenate))
+def EvaluateBackwards(values, targetValue, concatenate):
+	# Rather than trying every combination of operators going forwards, work backwards from the 
+	# target instead. Each operator can be undone using the last value, but only if that value 
+	# could actually have produced the target. That rules out most branches straight away:
+	#	+	The rest must add up to (target - last), so target can't be less than last.
+	#	*	The rest must multiply up to (target / last), so target must divide by last.
+	#	||	The rest is target with last's digits removed, so target must end in those digits.
+	# A list is used as a stack to avoid recursion, with each entry being how many values are left 
+	# and the target they need to reach.
+	stack = [(len(values), targetValue)]
+	while any(stack):
+		numValues, target = stack.pop()
+		last = values[numValues - 1]
+
+		if numValues == 1:
+			if target == last:
+				return True
+			continue
+
+		if target >= last:
+			stack.append((numValues - 1, target - last))
+
+		if last == 0:
+			# Multiplying by zero gives zero, no matter what came before.
+			if target == 0:
+				return True
+		elif target % last == 0:
+			stack.append((numValues - 1, target // last))
+
+		if concatenate:
+			power = NextPowerOfTen(last)
+			if target % power == last:
+				stack.append((numValues - 1, target // power))
+
+	return False
+
+def SumCalibrations(lines, concatenate, backwards):
+	# Parses & evaluates a batch of raw lines. Kept at the top level so that it can be handed off to
+	# worker processes, and takes raw lines so that the parsing is spread across them as well.
+	evaluate = backwards and EvaluateBackwards or Evaluate
+
+	return sum(key for key, values in map(ParseLine, lines) if evaluate(values, key, concatenate))
+
+def SolveParallel(inputFile, concatenate, backwards, workers, batchSize):
+	# How many batches to keep queued up per worker. Enough that no worker is left waiting on the 
+	# next batch, but few enough that the whole file never ends up in memory at once.
+	maxPending = workers * 4
+
+	result = 0
+	with open(inputFile) as inFile, ProcessPoolExecutor(max_workers = workers) as executor:
+		# Lines are read lazily from the file, so batches are only read in as they're needed.
+		batches = batched(filter(str.strip, inFile), batchSize)
+
+		pending = set()
+		for batch in batches:
+			pending.add(executor.submit(SumCalibrations, batch, concatenate, backwards))
+
+			# Some lines take far longer than others, and there's no telling which up front. So 
+			# rather than splitting the work evenly ahead of time, each new batch goes to whichever 
+			# worker frees up first.
+			if len(pending) >= maxPending:
+				done, pending = wait(pending, return_when = FIRST_COMPLETED)
+				result += sum(f.result() for f in done)
+
+		result += sum(f.result() for f in pending)
+
+	return result
+
+def Solve(inputFile, concatenate = False, backwards = False, workers = None, batchSize = 256):
+	if workers is not None:
+		return SolveParallel(inputFile, concatenate, backwards, workers, batchSize)
+
+	evaluate = backwards and EvaluateBackwards or Evaluate
+
+	return sum(key for key, values in Parse(inputFile) if evaluate(values, key, concatenate))
 
 testCases = [
 	("examples/Day07_ExampleA.txt", 3749),
@@ -40,8 +130,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert Solve(inputPath) == expected
+@pytest.mark.parametrize("backwards, workers", [(False, None), (True, None), (True, 2)])
+def test_part_a(inputPath, expected, backwards, workers):
+	assert Solve(inputPath, backwards = backwards, workers = workers, batchSize = 2) == expected
 
 testCases = [
 	("examples/Day07_ExampleB.txt", 11387),
@@ -49,8 +140,13 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert Solve(inputPath, concatenate = True) == expected
+@pytest.mark.parametrize("backwards, workers", [(False, None), (True, None), (True, 2)])
+def test_part_b(inputPath, expected, backwards, workers):
+	assert Solve(inputPath, concatenate = True, backwards = backwards, workers = workers, batchSize = 2) == expected
+
+@pytest.mark.parametrize("a, b", [(0, 0), (1, 0), (12, 345), (10, 10), (99, 100), (12345678901234567890, 98765432109876543210)])
+def test_concatenate(a, b):
+	assert Concatenate(a, b) == int(f"{a}{b}")
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
@@ -55,7 +55,138 @@ def FindPointsOnLine(start, end, gridSize, n = None):
 			yield point
 			i += 1
 
-def Solve(inputFile, limited = False):
+def HarmonicRange(start, step, limit):
+	# The range of k for which start + k * step stays within [0, limit), worked out with division 
+	# rather than stepping along until it falls off.
+	if step == 0:
+		return (-float("inf"), float("inf"))
+
+	# Python's floor division rounds towards negative infinity, so -(-a // b) is ceil(a / b).
+	low = -(start // step) if step > 0 else -((limit - 1 - start) // -step)
+	high = (limit - 1 - start) // step if step > 0 else start // -step
+
+	return (low, high)
+
+def FindAntinodeIndices(size, a, b, limited):
+	# Returns the antinodes for a pair of antennae as a range of indices into the flattened grid.
+	width, height = size
+	delta = (b[0] - a[0], b[1] - a[1])
+
+	if limited:
+		# Only the two points either side of the pair, one delta beyond each antenna. 
+		# Any two points make for an evenly spaced range, so it can still be returned as one.
+		points = [
+			x + y * width 
+			for x, y in ((a[0] - delta[0], a[1] - delta[1]), (b[0] + delta[0], b[1] + delta[1]))
+			if 0 <= x < width and 0 <= y < height
+		]
+		points.sort()
+
+		if len(points) == 0:
+			return range(0)
+		elif len(points) == 1:
+			return range(points[0], points[0] + 1)
+
+		return range(points[0], points[1] + 1, points[1] - points[0])
+
+	# Every whole multiple of the delta away from either antenna, same as FindPointsOnLine(). The delta 
+	# isn't reduced by its gcd: Points part way between multiples don't count, even though they're on 
+	# the line too.
+	step = delta
+
+	# Work out which multiples of the step stay on the grid along each axis, then take the overlap.
+	rangeX = HarmonicRange(a[0], step[0], width)
+	rangeY = HarmonicRange(a[1], step[1], height)
+	low, high = max(rangeX[0], rangeY[0]), min(rangeX[1], rangeY[1])
+
+	# On the flattened grid, points along the line are evenly spaced.
+	flatStart = a[0] + a[1] * width
+	flatStep = step[0] + step[1] * width
+	first, last = flatStart + low * flatStep, flatStart + high * flatStep
+
+	if flatStep < 0:
+		first, last, flatStep = last, first, -flatStep
+
+	return range(first, last + 1, flatStep)
+
+def MarkAntinodes(occupancy, size, a, b, limited):
+	# All of a pair's antinodes can be marked with a single slice assignment.
+	indices = FindAntinodeIndices(size, a, b, limited)
+	occupancy[indices.start:indices.stop:indices.step] = b"\x01" * len(indices)
+
+def SolveVectorised(inputFile, limited = False):
+	size, frequencies = Parse(inputFile)
+
+	# Every grid point gets a byte: Set to 1 once an antinode has been found there. Overlapping 
+	# antinodes simply land on the same byte, so no need to build & dedupe a set of tuples.
+	occupancy = bytearray(size[0] * size[1])
+
+	for antennae in frequencies.values():
+		for a, b in combinations(sorted(antennae), 2):
+			MarkAntinodes(occupancy, size, a, b, limited)
+
+	return occupancy.count(1)
+
+def CreateAntinodeMap(size, limited = False):
+	# An antinode map that can be updated one antenna at a time, rather than being recalculated 
+	# from scratch. Each grid point keeps count of how many antenna pairs put an antinode there, so 
+	# removing an antenna only clears a point once no other pair still needs it.
+	return {
+		"size": size,
+		"limited": limited,
+		"antennae": {},								# Frequency -> set of positions
+		"counts": [0] * (size[0] * size[1]),		# Flattened grid of antinode reference counts
+		"numAntinodes": 0							# Number of grid points with a count above zero
+	}
+
+def UpdatePairs(antinodeMap, frequency, position, change):
+	# Apply a change in reference count to the antinodes from every pair the given antenna makes with 
+	# the others of its frequency. Pairs not involving this antenna are left untouched.
+	counts = antinodeMap["counts"]
+
+	for other in antinodeMap["antennae"].get(frequency, set()):
+		if other == position:
+			continue
+
+		for i in FindAntinodeIndices(antinodeMap["size"], position, other, antinodeMap["limited"]):
+			before = counts[i]
+			counts[i] += change
+
+			# Only count points going from unoccupied to occupied, or back again.
+			antinodeMap["numAntinodes"] += (counts[i] > 0) - (before > 0)
+
+def AddAntenna(antinodeMap, frequency, position):
+	antennae = antinodeMap["antennae"].setdefault(frequency, set())
+	assert position not in antennae
+
+	UpdatePairs(antinodeMap, frequency, position, 1)
+	antennae.add(position)
+
+	return antinodeMap["numAntinodes"]
+
+def RemoveAntenna(antinodeMap, frequency, position):
+	antennae = antinodeMap["antennae"].get(frequency, set())
+	assert position in antennae
+
+	antennae.remove(position)
+	UpdatePairs(antinodeMap, frequency, position, -1)
+
+	return antinodeMap["numAntinodes"]
+
+def BuildAntinodeMap(inputFile, limited = False):
+	size, frequencies = Parse(inputFile)
+	antinodeMap = CreateAntinodeMap(size, limited)
+
+	for frequency, antennae in frequencies.items():
+		for position in sorted(antennae):
+			AddAntenna(antinodeMap, frequency, position)
+
+	return antinodeMap
+
+def Solve(inputFile, limited = False, vectorised = False):
+	if vectorised:
+		return SolveVectorised(inputFile, limited)
+
 	size, frequencies = Parse(inputFile)
 
 	allAntinodes = set()
@@ -71,8 +202,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert Solve(inputPath, limited = True) == expected
+@pytest.mark.parametrize("vectorised", [False, True])
+def test_part_a(inputPath, expected, vectorised):
+	assert Solve(inputPath, limited = True, vectorised = vectorised) == expected
 
 testCases = [
 	("examples/Day08_ExampleB.txt", 9),
@@ -81,8 +213,45 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert Solve(inputPath) == expected
+@pytest.mark.parametrize("vectorised", [False, True])
+def test_part_b(inputPath, expected, vectorised):
+	assert Solve(inputPath, vectorised = vectorised) == expected
+
+@pytest.mark.parametrize("limited", [False, True])
+def test_incremental(limited):
+	antinodeMap = BuildAntinodeMap("examples/Day08_ExampleA.txt", limited)
+	assert antinodeMap["numAntinodes"] == Solve("examples/Day08_ExampleA.txt", limited, vectorised = True)
+
+	# Taking away each antenna in turn, then putting it back, should land back where it started. 
+	# In between, the count should match a map built without that antenna.
+	for frequency, antennae in list(antinodeMap["antennae"].items()):
+		for position in sorted(antennae):
+			reduced = CreateAntinodeMap(antinodeMap["size"], limited)
+			for otherFrequency, others in antinodeMap["antennae"].items():
+				for other in others:
+					if (otherFrequency, other) != (frequency, position):
+						AddAntenna(reduced, otherFrequency, other)
+
+			assert RemoveAntenna(antinodeMap, frequency, position) == reduced["numAntinodes"]
+			AddAntenna(antinodeMap, frequency, position)
+
+	assert antinodeMap["numAntinodes"] == Solve("examples/Day08_ExampleA.txt", limited, vectorised = True)
+
+# The example grids only have pairs whose delta is already as small as it goes. Here the a's are two 
+# apart, so the block between them isn't an antinode, and neither is the A's.
+@pytest.mark.parametrize("grid, limited, expected", [
+	("Aa.a", False, 2), ("Aa.a", True, 0),
+	("a.....\n......\n..a...\n......", False, 2),
+	("a.....\n......\n..a...\n......\n....a.", False, 3),
+	("..a.a.a..", False, 5)
+])
+def test_non_primitive_delta(tmp_path, grid, limited, expected):
+	inputPath = tmp_path / "grid.txt"
+	inputPath.write_text(grid)
+
+	assert Solve(inputPath, limited) == expected
+	assert Solve(inputPath, limited, vectorised = True) == expected
+	assert BuildAntinodeMap(inputPath, limited)["numAntinodes"] == expected
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
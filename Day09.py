@@ -1,5 +1,7 @@
+import heapq
 import pytest
-from itertools import batched, pairwise
+from array import array
+from itertools import accumulate, batched, pairwise
 
 def Parse(inputFile):
 	caret = 0
@@ -23,8 +25,135 @@ def Parse(inputFile):
 			if len(circuit) > 1:
 				caret += int(circuit[1])
 
-def Solve(inputFile, contiguous = True):
+def ParseArrays(inputFile):
+	# A leaner take on Parse(): The disk is kept as parallel arrays, where a file's ID is its index.
+	# This takes a few bytes per file rather than a whole dict.
+	with open(inputFile, "rb") as inFile:
+		# Turn the ASCII digits straight into their values, without going through int() or str.
+		digits = inFile.read().strip().translate(DIGIT_VALUES)
+
+	# Every file starts where the previous file & gap end, so a running total over all the digits 
+	# gives the start of everything. Files are the even entries, gaps the odd ones.
+	starts = array("q", accumulate(digits, initial = 0))
+
+	return starts[0::2][:(len(digits) + 1) // 2], array("B", digits[0::2])
+
+# Translation table from ASCII digits to their values.
+DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+# Files (and so any gap worth tracking) are never bigger than a single digit.
+MAX_BLOCK_SIZE = 9
+
+def SeriesSum(id, position, size):
+	# A file covers a consecutive run of blocks, so instead of adding up each block we can use the 
+	# arithmetic series formula: id * (p + (p + 1) + ... + (p + size - 1)).
+	return id * (size * position + size * (size - 1) // 2)
+
+def CalculateChecksum(disk):
+	return sum(SeriesSum(file["id"], file["position"], file["size"]) for file in disk)
+
+def CalculateArrayChecksum(positions, sizes):
+	# Same as CalculateChecksum(), but mapped straight over the arrays. IDs are just each file's index.
+	return sum(map(SeriesSum, range(len(positions)), positions, sizes))
+
+def CompactContiguous(positions, sizes):
+	# Index the free space by size: One min-heap of positions per gap size. The leftmost gap that fits
+	# a file is then the smallest position at the top of the heaps for that size and upwards. With 
+	# only 9 sizes, that's at most 9 peeks instead of a scan over every free block.
+	freeBlocks = [[] for _ in range(MAX_BLOCK_SIZE + 1)]
+	for id in range(len(positions) - 1):
+		freeStart = positions[id] + sizes[id]
+		gapSize = positions[id + 1] - freeStart
+
+		assert gapSize <= MAX_BLOCK_SIZE
+		if gapSize > 0:
+			freeBlocks[gapSize].append(freeStart)
+
+	for heap in freeBlocks:
+		heapq.heapify(heap)
+
+	# Same as Solve(), each file only gets one attempt at moving, starting from the rightmost.
+	for id in range(len(positions) - 1, -1, -1):
+		size = sizes[id]
+		if size == 0:
+			continue
+
+		# Find the leftmost gap big enough for the file.
+		best = None
+		for gapSize in range(size, MAX_BLOCK_SIZE + 1):
+			heap = freeBlocks[gapSize]
+			if heap and (best is None or heap[0] < freeBlocks[best][0]):
+				best = gapSize
+
+		# Files only ever move left.
+		if best is None or freeBlocks[best][0] >= positions[id]:
+			continue
+
+		gapPosition = heapq.heappop(freeBlocks[best])
+		positions[id] = gapPosition
+
+		# Whatever's left of the gap goes back in under its new size.
+		remaining = best - size
+		if remaining > 0:
+			heapq.heappush(freeBlocks[remaining], gapPosition + size)
+
+	return positions
+
+def CompactFragmented(positions, sizes):
+	# When files can be broken up, every gap gets filled block by block from the end of the disk. 
+	# So rather than moving anything, just walk two cursors towards each other: One along the disk 
+	# from the left (files staying put, then the gap after each), and one pulling blocks off the 
+	# rightmost file not yet used up. The checksum is tallied as blocks are "placed", so no fragments 
+	# ever need to be built.
+	checksum = 0
+
+	right = len(positions) - 1
+	rightRemaining = sizes[right]
+
+	for left in range(len(positions)):
+		# Once the cursors meet, whatever's left of that file stays where it started. Everything 
+		# before it is packed solid by now, so that's the same spot the left cursor has reached.
+		if left == right:
+			checksum += SeriesSum(right, positions[right], rightRemaining)
+			break
+
+		# The file on the left stays where it is.
+		checksum += SeriesSum(left, positions[left], sizes[left])
+
+		# Then fill the gap after it from the right, for as long as there's anything left to move.
+		position = positions[left] + sizes[left]
+		gapSize = positions[left + 1] - position
+		while gapSize > 0 and right > left:
+			moved = min(gapSize, rightRemaining)
+			checksum += SeriesSum(right, position, moved)
+
+			position += moved
+			gapSize -= moved
+			rightRemaining -= moved
+
+			# Move onto the next file along once this one's used up.
+			if rightRemaining == 0:
+				right -= 1
+				rightRemaining = sizes[right]
+
+		if right <= left:
+			break
+
+	return checksum
+
+def Solve(inputFile, contiguous = True, indexed = False):
+	# The array-based engines: A heap-indexed allocator for moving whole files, and a two-cursor 
+	# sweep for moving files piecemeal.
+	if indexed:
+		positions, sizes = ParseArrays(inputFile)
+
+		if not contiguous:
+			return CompactFragmented(positions, sizes)
+
+		return CalculateArrayChecksum(CompactContiguous(positions, sizes), sizes)
+
 	disk = list(Parse(inputFile))
+
 	disk.sort(key = lambda f: f["position"])
 
 	# Because of the scale of the input data, a registry of free blocks is required. 
@@ -84,12 +213,7 @@ def Solve(inputFile, contiguous = True):
 				freeBlocks.remove(availableBlock)
 
 	# Process the checksum.
-	checksum = 0
-	for file in disk:
-		for x in range(file["position"], file["position"] + file["size"]):
-			checksum += file["id"] * x
-
-	return checksum
+	return CalculateChecksum(disk)
 
 testCases = [
 	("examples/Day09_Example.txt", 1928),
@@ -97,8 +221,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert Solve(inputPath, contiguous = False) == expected
+@pytest.mark.parametrize("indexed", [False, True])
+def test_part_a(inputPath, expected, indexed):
+	assert Solve(inputPath, contiguous = False, indexed = indexed) == expected
 
 testCases = [
 	("examples/Day09_Example.txt", 2858),
@@ -106,8 +231,18 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert Solve(inputPath) == expected
+@pytest.mark.parametrize("indexed", [False, True])
+def test_part_b(inputPath, expected, indexed):
+	assert Solve(inputPath, indexed = indexed) == expected
+
+# A zero-size first file leaves a gap starting at block 0, which mustn't be mistaken for no gap at all.
+@pytest.mark.parametrize("diskMap, expected", [("0312", 0), ("0312132", 10), ("02131", 1)])
+@pytest.mark.parametrize("indexed", [False, True])
+def test_zero_size_first_file(tmp_path, diskMap, expected, indexed):
+	inputPath = tmp_path / "disk.txt"
+	inputPath.write_text(diskMap)
+
+	assert Solve(inputPath, indexed = indexed) == expected
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
@@ -59,7 +59,65 @@ def ExploreTrailhead(startPoint, distinct):
 	# grand scale of things. 
 	return len(distinct and completed or set(completed))
 
-def Solve(inputFile, countDistinctRoutes = False):
+def ParseLayers(inputFile):
+	# The grid as one flat block of heights, with each row followed by a gutter cell that can never 
+	# be walked onto. Moving between rows is then just +/- the stride, and the gutter stops trails 
+	# from wrapping around from the end of one row to the start of the next.
+	with open(inputFile, "rb") as inFile:
+		grid = inFile.read().replace(b"\r", b"").strip() + b"\n"
+
+	stride = grid.index(b"\n") + 1
+
+	# Digits become their heights, while anything else (gutters, impassable tiles) becomes a height 
+	# that no trail could ever reach.
+	heights = grid.translate(HEIGHT_VALUES)
+
+	# Bucket every cell by height, so the trails can be worked through one height at a time.
+	layers = [[] for _ in range(10)]
+	for i, h in enumerate(heights):
+		if h < 10:
+			layers[h].append(i)
+
+	return stride, heights, layers
+
+# Translation table from ASCII digits to their heights. Everything else is set out of reach.
+HEIGHT_VALUES = bytes(c - ord("0") if ord("0") <= c <= ord("9") else 0xFF for c in range(256))
+
+def SolveLayered(inputFile, countDistinctRoutes = False):
+	stride, heights, layers = ParseLayers(inputFile)
+
+	# Rather than following trails up from every trailhead, work down from the summits one height at 
+	# a time. Each cell's result is built from the cells one step above it, which are already done.
+	# Every cell is visited once, no matter how many trails run through it.
+	#	Rating: Number of distinct trails from a cell to any summit, i.e. the sum of its uphill 
+	#	        neighbours' trails.
+	#	Score:  Set of summits reachable from a cell, as a bitset with one bit per summit, i.e. the 
+	#	        union of its uphill neighbours' summits.
+	results = [0] * len(heights)
+	for i, position in enumerate(layers[9]):
+		results[position] = countDistinctRoutes and 1 or (1 << i)
+
+	for h in range(8, -1, -1):
+		for position in layers[h]:
+			total = 0
+			for neighbour in (position - stride, position - 1, position + 1, position + stride):
+				if 0 <= neighbour < len(heights) and heights[neighbour] == h + 1:
+					if countDistinctRoutes:
+						total += results[neighbour]
+					else:
+						total |= results[neighbour]
+
+			results[position] = total
+
+	if countDistinctRoutes:
+		return sum(results[position] for position in layers[0])
+
+	return sum(results[position].bit_count() for position in layers[0])
+
+def Solve(inputFile, countDistinctRoutes = False, layered = False):
+	if layered:
+		return SolveLayered(inputFile, countDistinctRoutes)
+
 	pathNodes = Parse(inputFile)
 
 	# First, use a list to build a stack - This way, we can avoid extensive recursion. 
@@ -79,8 +137,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert Solve(inputPath) == expected
+@pytest.mark.parametrize("layered", [False, True])
+def test_part_a(inputPath, expected, layered):
+	assert Solve(inputPath, layered = layered) == expected
 
 testCases = [
 	("examples/Day10_ExampleF.txt", 3),
@@ -91,8 +150,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert Solve(inputPath, countDistinctRoutes = True) == expected
+@pytest.mark.parametrize("layered", [False, True])
+def test_part_b(inputPath, expected, layered):
+	assert Solve(inputPath, countDistinctRoutes = True, layered = layered) == expected
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
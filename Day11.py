@@ -1,6 +1,6 @@
 import pytest
-from math import log10
-from collections import Counter
+from collections import Counter, OrderedDict
+from operator import add, mul, sub
 
 '''
 APPROACH:
@@ -31,12 +31,47 @@ APPROACH:
 		Calculate for 75 blinks.
 		The problem here comes from the exponential growth of stones in each blink.
 		Handling each stone individually will end up taking too much time, akin to the Game of Rice.
+
+	For very deep blinks (transitions = True):
+		However many blinks happen, the stones only ever take a few thousand distinct values. Find that 
+		closed set up front and index it, so a blink is just two lookups per value rather than a fresh 
+		Counter. Past that, the stone counts form a linear recurrence. Given a prime modulus, find it 
+		with Berlekamp-Massey and then jump straight to the requested blink by repeated squaring 
+		(Bostan-Mori), so millions of blinks take about as long as a few thousand.
+
+	For counts at many depths (SolveSeries):
+		A stone's future only depends on its value and how many blinks are left, so remember the count 
+		for each (value, blinks) pair in a memo that's shared by every query in the process. The first 
+		query does the work, and any later one that touches the same pairs just looks them up.
 '''
 
 def Parse(inputFile):
 	with open(inputFile) as inFile:
 		return [int(n) for n in inFile.read().strip().split(" ")]
 
+def CountDigits(value):
+	# Exact number of digits in a (positive) value. log10 is only as good as a float, so it slips for 
+	# large values (e.g. log10(10 ** 15 - 1) comes out as exactly 15.0). 
+	# The bit length gives an estimate instead: 1233 / 4096 is just under log10(2), so it never 
+	# overshoots. It does fall further short as values grow (one digit every ~200k bits or so), so 
+	# it's raised against powers of ten until it's exact. For everyday values that's one check.
+	estimate = value.bit_length() * 1233 >> 12
+	while value >= 10 ** estimate:
+		estimate += 1
+
+	return estimate
+
+def BlinkStone(value):
+	# The same rules as Blink(), but for a single stone. Returns whatever it turns into.
+	if value == 0:
+		return (1,)
+
+	numDigits = CountDigits(value)
+	if numDigits % 2 == 0:
+		return divmod(value, 10 ** (numDigits // 2))
+
+	return (value * 2024,)
+
 def Blink(stones):
 	# A dict can work here as well, but using a Counter lets us skip certain explicit behaviour 
 	# (e.g. checking if a key exists before append to it).
@@ -46,15 +81,11 @@ def Blink(stones):
 		if id == 0:
 			updated[1] += count
 		else:
-			# Number of digits used to represent x can be easily found with the equation
-			# `x = floor(log10(x)) + 1`. Integer casting is used in place of math.floor() to avoid 
-			# pulling in another library. 
-			numDigits = int(log10(id))
-
-			# As the equation above will normally return 0 for even-digit numbers, we can simply
-			# skip the increment-by-one by inverting the two cases.  
-			if numDigits % 2:
-				splitMark = 10 ** int((numDigits + 1) / 2)
+			# Stones with an even number of digits are split down the middle. The "split mark" is
+			# 10 to the power of half the number of digits.
+			numDigits = CountDigits(id)
+			if numDigits % 2 == 0:
+				splitMark = 10 ** (numDigits // 2)
 				a, b = divmod(id, splitMark)
 
 				# Since we're splitting each stone into two, add the original amount to both stacks.
@@ -68,14 +99,264 @@ def Blink(stones):
 	# different values).  
 	return updated
 
-def Solve(inputFile, numBlinks):
+def BuildTransitions(values, maxValues = 100000):
+	# Find every value the given stones can ever turn into, and index them. For each value, the 
+	# transitions hold the index of the first stone it turns into and that of the second - Or of an 
+	# extra always-zero slot at the end, for values that don't split.
+	# The rules always bring stones back down to a small set of values, so this closes quickly.
+	index = {}
+	pending = list(values)
+	children = []
+
+	while len(pending) > 0:
+		value = pending.pop()
+		if value in index:
+			continue
+
+		if len(index) >= maxValues:
+			raise Exception(f"Stone values didn't close within {maxValues} values")
+
+		index[value] = len(children)
+		children.append(BlinkStone(value))
+		pending.extend(children[-1])
+
+	empty = len(children)
+
+	return {
+		"index": index,
+		"first": [index[c[0]] for c in children],
+		"second": [index[c[1]] if len(c) > 1 else empty for c in children]
+	}
+
+# Counts can at most double with each blink, so a modulus only needs applying every so often to keep 
+# the numbers from growing out of hand. Reducing less often saves a pass over every count per blink.
+REDUCE_INTERVAL = 16
+
+def StepCounts(counts, transitions, modulus = None):
+	# counts[i] is the number of stones that a single stone of value i becomes after some number of 
+	# blinks. One more blink is then just the sum of the counts for whatever it turns into, which can 
+	# be gathered for every value at once. If a modulus is given, the new counts are reduced by it.
+	first, second = transitions["first"], transitions["second"]
+	counts = list(map(add, map(counts.__getitem__, first), map(counts.__getitem__, second)))
+
+	if modulus is not None:
+		counts = list(map(modulus.__rmod__, counts))
+
+	# The always-zero slot for values that don't split.
+	counts.append(0)
+
+	return counts
+
+def FindRecurrence(sequence, modulus):
+	# Berlekamp-Massey: The shortest recurrence s[n] = -(c[1] * s[n - 1] + ... + c[L] * s[n - L]) 
+	# that produces the sequence, modulo a prime. Returns [1, c[1], ..., c[L]].
+	current, previous = [1], [1]
+	length, shift, lastDiscrepancy = 0, 1, 1
+
+	for n, term in enumerate(sequence):
+		discrepancy = (term + sum(map(mul, current[1:length + 1], sequence[n - length:n][::-1]))) % modulus
+		if discrepancy == 0:
+			shift += 1
+			continue
+
+		# Correct the recurrence by a multiple of the one from before the last change in length.
+		scale = discrepancy * pow(lastDiscrepancy, -1, modulus) % modulus
+		updated = current + [0] * max(0, len(previous) + shift - len(current))
+		updated[shift:shift + len(previous)] = map(
+			modulus.__rmod__, map(sub, updated[shift:shift + len(previous)], map(scale.__mul__, previous))
+		)
+
+		if 2 * length <= n:
+			length, previous, lastDiscrepancy, shift = n + 1 - length, current, discrepancy, 1
+		else:
+			shift += 1
+
+		current = updated
+
+	return (current + [0] * length)[:length + 1]
+
+def MultiplyPolynomials(a, b, modulus):
+	# Kronecker substitution: Pack each list of coefficients into one big integer with enough room 
+	# per coefficient that none of the products can overflow into the next, and let a single integer 
+	# multiplication do all of the work.
+	width = (2 * modulus.bit_length() + min(len(a), len(b)).bit_length() + 7) // 8
+
+	def Pack(coefficients):
+		return int.from_bytes(b"".join(c.to_bytes(width, "little") for c in coefficients), "little")
+
+	product = (Pack(a) * Pack(b)).to_bytes(width * (len(a) + len(b) - 1), "little")
+
+	return [int.from_bytes(product[i:i + width], "little") % modulus for i in range(0, len(product), width)]
+
+def FindNthTerm(numerator, denominator, n, modulus):
+	# Bostan-Mori: The nth term of the sequence with generating function P(x) / Q(x). 
+	# Multiplying top & bottom by Q(-x) leaves only even powers of x on the bottom, so half of the 
+	# terms on top can be dropped & the rest halved in power. Halving n each time, this takes log2(n)
+	# rounds rather than n steps.
+	while n > 0:
+		negated = [i % 2 and (modulus - c) % modulus or c for i, c in enumerate(denominator)]
+
+		numerator = MultiplyPolynomials(numerator, negated, modulus)[n % 2::2]
+		denominator = MultiplyPolynomials(denominator, negated, modulus)[0::2]
+		n //= 2
+
+	return numerator[0] * pow(denominator[0], -1, modulus) % modulus
+
+def SolveTransitions(inputFile, numBlinks, modulus = None):
+	stones = Counter(Parse(inputFile))
+	transitions = BuildTransitions(stones.keys())
+
+	starts = [transitions["index"][value] for value in stones.keys()]
+	quantities = list(stones.values())
+
+	def CountStones(counts):
+		total = sum(map(mul, quantities, map(counts.__getitem__, starts)))
+		if modulus is not None:
+			total %= modulus
+
+		return total
+
+	# With no blinks, each stone is just itself.
+	counts = [1] * len(transitions["first"]) + [0]
+
+	# A recurrence can't be any longer than the number of values there are, so twice that many terms 
+	# is enough to pin it down. Anything shallower than that (or without a modulus to keep the numbers 
+	# in check) is just stepped through.
+	numTerms = 2 * len(transitions["first"])
+	if modulus is None or numBlinks < numTerms:
+		for i in range(numBlinks):
+			counts = StepCounts(counts, transitions, i % REDUCE_INTERVAL == 0 and modulus or None)
+
+		return CountStones(counts)
+
+	sequence = []
+	for i in range(numTerms):
+		sequence.append(CountStones(counts))
+		counts = StepCounts(counts, transitions, i % REDUCE_INTERVAL == 0 and modulus or None)
+
+	# The generating function of the counts is P(x) / Q(x), where Q comes from the recurrence and P 
+	# from the first few terms of the sequence.
+	denominator = FindRecurrence(sequence, modulus)
+	length = len(denominator) - 1
+	numerator = MultiplyPolynomials(sequence[:max(1, length)], denominator, modulus)[:max(1, length)]
+
+	return FindNthTerm(numerator, denominator, numBlinks, modulus)
+
+# Shared by every query in the process: (value, blinks) -> number of stones. Each value's counts are 
+# kept together as one list indexed by blinks, so they can be extended a run at a time. Values are kept 
+# in least-recently used order, and once the memo holds more counts than its capacity, the values that 
+# haven't been needed in a while are dropped first.
+STONE_MEMO = {
+	"entries": OrderedDict(),
+	"size": 0,
+	"capacity": 1 << 20,
+	"hits": 0,
+	"misses": 0
+}
+
+def TrimStoneMemo():
+	entries = STONE_MEMO["entries"]
+	while STONE_MEMO["size"] > STONE_MEMO["capacity"] and len(entries) > 0:
+		value, series = entries.popitem(last = False)
+		STONE_MEMO["size"] -= len(series)
+
+def ResizeStoneMemo(capacity):
+	STONE_MEMO["capacity"] = capacity
+	TrimStoneMemo()
+
+def ClearStoneMemo():
+	STONE_MEMO["entries"].clear()
+	STONE_MEMO["size"] = STONE_MEMO["hits"] = STONE_MEMO["misses"] = 0
+
+def FindStoneSeries(value, maxBlinks):
+	# How many stones a single stone becomes after each of 0..maxBlinks blinks. Worked through with a 
+	# stack rather than recursion, as a deep enough query would run out of call stack.
+	entries = STONE_MEMO["entries"]
+
+	# Every value touched by this query, and how many counts it had in the memo beforehand.
+	working = {}
+	previousLengths = {}
+
+	def Lookup(stone):
+		if stone not in working:
+			if stone in entries:
+				STONE_MEMO["hits"] += 1
+				entries.move_to_end(stone)
+				working[stone] = entries[stone]
+				previousLengths[stone] = len(working[stone])
+			else:
+				# With no blinks, a stone is just itself.
+				working[stone] = [1]
+				previousLengths[stone] = 0
+
+		return working[stone]
+
+	pending = [(value, maxBlinks)]
+	while len(pending) > 0:
+		stone, blinks = pending[-1]
+		series = Lookup(stone)
+		if len(series) > blinks:
+			pending.pop()
+			continue
+
+		# A stone's count after n blinks is the sum of its children's counts after n - 1 blinks. 
+		# So only once those are known that far can this one be extended.
+		children = BlinkStone(stone)
+		childSeries = [Lookup(c) for c in children]
+		missing = [(c, blinks - 1) for c, cs in zip(children, childSeries) if len(cs) < blinks]
+		if any(missing):
+			pending.extend(missing)
+			continue
+
+		pending.pop()
+		start = len(series)
+		if len(childSeries) == 1:
+			series.extend(childSeries[0][start - 1:blinks])
+		else:
+			series.extend(map(add, childSeries[0][start - 1:blinks], childSeries[1][start - 1:blinks]))
+
+	# Only now that the query's done is anything new put into the memo (and anything old evicted), 
+	# so nothing the query still needed could go missing part way through.
+	for stone, series in working.items():
+		STONE_MEMO["misses"] += len(series) - max(previousLengths[stone], 1)
+		STONE_MEMO["size"] += len(series) - previousLengths[stone]
+
+		entries[stone] = series
+		entries.move_to_end(stone)
+
+	result = working[value][:maxBlinks + 1]
+	TrimStoneMemo()
+
+	return result
+
+def CountSeries(stones, maxBlinks):
+	# Number of stones after each of 0..maxBlinks blinks, for a list of stone values. 
+	# As with Blink(), identical stones only need working out once.
+	series = [0] * (maxBlinks + 1)
+
+	for value, quantity in Counter(stones).items():
+		series = list(map(add, series, map(quantity.__mul__, FindStoneSeries(value, maxBlinks))))
+
+	return series
+
+def SolveSeries(inputFile, maxBlinks):
+	return CountSeries(Parse(inputFile), maxBlinks)
+
+def Solve(inputFile, numBlinks, transitions = False, modulus = None):
+	if transitions:
+		return SolveTransitions(inputFile, numBlinks, modulus)
+
 	stones = Counter(Parse(inputFile))
 
 	for i in range(numBlinks):
 		stones = Blink(stones)
 
 	# We don't care what values each stone has, just how many there are. 
-	return sum(stones.values())
+	total = sum(stones.values())
+	if modulus is not None:
+		total %= modulus
+
+	return total
 
 testCases = [
 	("examples/Day11_ExampleA.txt", 1, 7),
@@ -95,5 +376,47 @@ testCases = [
 def test_part_b(inputPath, numBlinks, expected):
 	assert Solve(inputPath, numBlinks) == expected
 
+@pytest.mark.parametrize("value", [1, 9, 10, 99, 100, 10 ** 15 - 1, 10 ** 15, 10 ** 40 - 1, 2 ** 200])
+def test_count_digits(value):
+	assert CountDigits(value) == len(str(value))
+
+# Past a few thousand digits str() refuses to convert, so check either side of each power of ten instead.
+@pytest.mark.parametrize("numDigits", [4300, 10000, 100000, 300000])
+def test_count_digits_large(numDigits):
+	power = 10 ** numDigits
+	assert CountDigits(power - 1) == numDigits
+	assert CountDigits(power) == numDigits + 1
+	assert CountDigits(7 * power // 10) == numDigits
+
+@pytest.mark.parametrize("stones", ["0", "125 17", "0 1 10 99 999"])
+@pytest.mark.parametrize("numBlinks", [0, 1, 25, 500])
+@pytest.mark.parametrize("modulus", [None, 1000000007])
+def test_transitions(tmp_path, stones, numBlinks, modulus):
+	inputPath = tmp_path / "stones.txt"
+	inputPath.write_text(stones)
+
+	assert Solve(inputPath, numBlinks, transitions = True, modulus = modulus) == Solve(inputPath, numBlinks, modulus = modulus)
+
+def test_series():
+	ClearStoneMemo()
+	assert SolveSeries("examples/Day11_ExampleB.txt", 6) == [2, 3, 4, 5, 9, 13, 22]
+
+	# Every depth should agree with blinking from scratch.
+	series = SolveSeries("examples/Day11_ExampleB.txt", 75)
+	assert series == [Solve("examples/Day11_ExampleB.txt", n) for n in range(76)]
+
+	# Asking again should only need lookups.
+	misses = STONE_MEMO["misses"]
+	assert SolveSeries("examples/Day11_ExampleB.txt", 75) == series
+	assert STONE_MEMO["misses"] == misses
+
+	# Even a memo too small to hold a single query's worth should still get the right answers.
+	ResizeStoneMemo(16)
+	assert STONE_MEMO["size"] <= 16
+	assert CountSeries([125, 17], 40) == series[:41]
+
+	ResizeStoneMemo(1 << 20)
+	ClearStoneMemo()
+
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
@@ -1,5 +1,8 @@
 import pytest
 import re
+from array import array
+from math import gcd, inf
+from operator import mul, sub
 
 '''
 APPROACH:
@@ -20,6 +23,13 @@ APPROACH:
 	For Part 2:
 		A "handicap" of 1e13 is applied to each axis of each game's target coordinates.
 		Increment c & d each by it and proceed as normal.
+
+	Batched (batched = True):
+		Load every game into columns of integers and run Cramer's rule down whole columns at once, 
+		checking for whole numbers with divmod() instead of floats. Floats run out of precision once
+		the handicap is involved, which integers never do.
+		Games where both buttons move along the same line (a determinant of zero) don't have a single 
+		solution, so instead the cheapest one is picked out of all of them.
 '''
 
 def Parse(inputFile):
@@ -52,7 +62,116 @@ def SolveGame(game, handicap):
 	# Spec details that it wants 3a + b for each game.  
 	return (3 * int(a)) + int(b)
 
-def Solve(inputFile, handicap = 0):
+def ParseBatch(inputFile):
+	# Every game is exactly six numbers in the same order, so there's no need to match the whole 
+	# layout: Blank out everything that isn't part of a number, split what's left, then divide the 
+	# numbers into columns with stepped slices.
+	with open(inputFile, "rb") as inFile:
+		numbers = array("q", map(int, inFile.read().translate(NUMBER_CHARACTERS).split()))
+
+	return {k: numbers[i::6] for i, k in enumerate(("ax", "ay", "bx", "by", "c", "d"))}
+
+# Translation table keeping digits & signs, and turning everything else into spaces.
+NUMBER_CHARACTERS = bytes(c if chr(c) in "0123456789+-" else ord(" ") for c in range(256))
+
+def ExtendedGcd(a, b):
+	# Finds x & y such that a * x + b * y = gcd(a, b).
+	x, y, nextX, nextY = 1, 0, 0, 1
+	while b != 0:
+		quotient, remainder = divmod(a, b)
+		a, b = b, remainder
+		x, nextX = nextX, x - quotient * nextX
+		y, nextY = nextY, y - quotient * nextY
+
+	if a < 0:
+		return -a, -x, -y
+
+	return a, x, y
+
+def SolveColinearGame(ax, ay, bx, by, c, d):
+	# Both buttons move along the same line, so there's either no way to reach the prize, or a whole 
+	# family of ways - Of which the cheapest is wanted.
+	if (ax, ay) == (0, 0) and (bx, by) == (0, 0):
+		return 0
+
+	# The prize has to be on the same line as the buttons to be reachable at all.
+	ux, uy = (ax, ay) != (0, 0) and (ax, ay) or (bx, by)
+	if ux * d - uy * c != 0:
+		return 0
+
+	# Everything's a whole number of steps along the line's smallest step, so it comes down to one
+	# equation: a * stepsA + b * stepsB = stepsPrize.
+	divisor = gcd(ux, uy)
+	gx, gy = ux // divisor, uy // divisor
+
+	def StepsAlong(x, y):
+		if gx != 0:
+			return x // gx
+
+		return y // gy
+
+	stepsA, stepsB, stepsPrize = StepsAlong(ax, ay), StepsAlong(bx, by), StepsAlong(c, d)
+
+	# Any one solution comes from the extended Euclidean algorithm. Every other is then
+	# a = a0 + t * shiftA, b = b0 + t * shiftB for some whole number t.
+	divisor, x, y = ExtendedGcd(stepsA, stepsB)
+	if stepsPrize % divisor != 0:
+		return 0
+
+	a0, b0 = x * (stepsPrize // divisor), y * (stepsPrize // divisor)
+	shiftA, shiftB = stepsB // divisor, -stepsA // divisor
+
+	# Neither button can be pressed a negative number of times, which limits how far t can go.
+	low, high = -inf, inf
+	for base, shift in ((a0, shiftA), (b0, shiftB)):
+		if shift > 0:
+			low = max(low, -(base // shift))
+		elif shift < 0:
+			high = min(high, base // -shift)
+		elif base < 0:
+			return 0
+
+	if low > high:
+		return 0
+
+	# The cost changes by a fixed amount with each step of t, so the cheapest is at one end or the 
+	# other. As presses can't go negative, the cost can't fall forever - The cheap end is always finite.
+	slope = 3 * shiftA + shiftB
+	if slope > 0 or (slope == 0 and low != -inf):
+		t = low
+	else:
+		t = high
+
+	return 3 * (a0 + t * shiftA) + (b0 + t * shiftB)
+
+def SolveBatch(games, handicap = 0):
+	ax, ay, bx, by = games["ax"], games["ay"], games["bx"], games["by"]
+	c = list(map(handicap.__add__, games["c"]))
+	d = list(map(handicap.__add__, games["d"]))
+
+	# Cramer's rule for every game at once.
+	determinants = map(sub, map(mul, ax, by), map(mul, ay, bx))
+	numeratorsA = map(sub, map(mul, by, c), map(mul, bx, d))
+	numeratorsB = map(sub, map(mul, ax, d), map(mul, ay, c))
+
+	total = 0
+	for i, (determinant, numeratorA, numeratorB) in enumerate(zip(determinants, numeratorsA, numeratorsB)):
+		if determinant == 0:
+			total += SolveColinearGame(ax[i], ay[i], bx[i], by[i], c[i], d[i])
+			continue
+
+		# A game only has a clean solution if both divide exactly, and neither is negative.
+		a, remainderA = divmod(numeratorA, determinant)
+		b, remainderB = divmod(numeratorB, determinant)
+		if remainderA == 0 and remainderB == 0 and a >= 0 and b >= 0:
+			total += 3 * a + b
+
+	return total
+
+def Solve(inputFile, handicap = 0, batched = False):
+	if batched:
+		return SolveBatch(ParseBatch(inputFile), handicap)
+
 	return sum(SolveGame(game, handicap) for game in Parse(inputFile))
 
 testCases = [
@@ -61,8 +180,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert Solve(inputPath) == expected
+@pytest.mark.parametrize("batched", [False, True])
+def test_part_a(inputPath, expected, batched):
+	assert Solve(inputPath, batched = batched) == expected
 
 testCases = [
 	("examples/Day13_Example.txt", 875318608908),
@@ -70,8 +190,27 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert Solve(inputPath, handicap = 10000000000000) == expected
+@pytest.mark.parametrize("batched", [False, True])
+def test_part_b(inputPath, expected, batched):
+	assert Solve(inputPath, handicap = 10000000000000, batched = batched) == expected
+
+@pytest.mark.parametrize("game", [
+	(2, 2, 1, 1, 10, 10),			# B is cheaper per step
+	(6, 6, 1, 1, 10, 10),			# A is cheaper per step
+	(4, 6, 6, 9, 14, 21),			# Only some mixes land exactly
+	(4, 6, 6, 9, 15, 21),			# Prize off the line
+	(3, 0, 5, 0, 7, 0),				# No mix of presses reaches it
+	(0, 3, 0, -2, 0, 7),			# Buttons pulling in opposite directions
+	(0, 0, 2, 3, 8, 12),			# A does nothing at all
+])
+def test_colinear(game):
+	ax, ay, bx, by, c, d = game
+	costs = [
+		3 * a + b for a in range(60) for b in range(60)
+		if a * ax + b * bx == c and a * ay + b * by == d
+	]
+
+	assert SolveColinearGame(*game) == min(costs, default = 0)
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
@@ -1,7 +1,10 @@
 import pytest
+import random
 import re
+from array import array
 from collections import Counter
-from math import prod
+from math import gcd, prod
+from operator import add, mul
 
 '''
 APPROACH:
@@ -23,6 +26,19 @@ APPROACH:
 		So: Find the first timeframe where the number of unique robot positions matches the number of
 		robots, and pray 
 		(Spoiler: It worked)
+
+	Part 2, periodic (PartBPeriodic(inputFile, gridSize, statistic)):
+		Rather than trying every second, look at each axis on its own. A robot's x position repeats 
+		every gridSize[0] seconds, and its y position every gridSize[1] seconds. When the robots form a 
+		picture, they're bunched together along both axes - So find the offset into each period where 
+		the robots are bunched up the most (lowest variance, or most robots sharing a row/column). 
+		The Chinese Remainder Theorem then gives the one second that lines up with both offsets.
+		That's one pass per offset along each axis (~200) rather than up to ~10k full simulations.
+
+	Swarms:
+		For large numbers of robots, a dict per robot is the bottleneck. Instead, keep each of px, py, 
+		vx & vy as one array across the whole swarm, so jumping to any second is a handful of map() 
+		calls, and the quadrant & density counts are done by a single Counter pass over the lot.
 '''
 
 def Parse(inputFile):
@@ -32,6 +48,63 @@ def Parse(inputFile):
 		for match in robotRegex.finditer(inFile.read()):
 			yield {k:int(v) for k,v in match.groupdict().items()}
 
+def ParseSwarm(inputFile):
+	# Each robot is four numbers in a fixed order, so blank out everything else, split what's left, 
+	# and divide it into columns with stepped slices.
+	with open(inputFile, "rb") as inFile:
+		numbers = array("q", map(int, inFile.read().translate(NUMBER_CHARACTERS).split()))
+
+	return {k: numbers[i::4] for i, k in enumerate(("px", "py", "vx", "vy"))}
+
+# Translation table keeping digits & minus signs, and turning everything else into spaces.
+NUMBER_CHARACTERS = bytes(c if chr(c) in "0123456789-" else ord(" ") for c in range(256))
+
+def PositionsAt(swarm, gridSize, seconds):
+	# Where every robot in the swarm is after the given number of seconds - Same as SimulateMovement(), 
+	# but down whole columns at once and without touching the swarm itself.
+	width, height = gridSize
+
+	xs = array("q", map(width.__rmod__, map(add, swarm["px"], map(seconds.__mul__, swarm["vx"]))))
+	ys = array("q", map(height.__rmod__, map(add, swarm["py"], map(seconds.__mul__, swarm["vy"]))))
+
+	return xs, ys
+
+def SimulateSwarm(swarm, gridSize, times):
+	# Jumps straight to each of the given seconds in turn. As each jump starts from the swarm's initial 
+	# positions, the times can come in any order.
+	for seconds in times:
+		yield (seconds, *PositionsAt(swarm, gridSize, seconds))
+
+def CountQuadrants(xs, ys, gridSize):
+	# Number of robots in each quadrant, in reading order (top-left, top-right, bottom-left, 
+	# bottom-right). Robots on either midpoint line aren't counted.
+	# Every column is given a value of 0 (left) or 1 (right), and every row 0 (top) or 2 (bottom), so 
+	# each robot's quadrant is just the sum of the two. The midpoint lines are given values that push 
+	# the sum past 3, so they end up outside the quadrants.
+	assert all(s % 2 for s in gridSize)
+	center = tuple(gs // 2 for gs in gridSize)
+
+	columnValues = [0] * center[0] + [4] + [1] * center[0]
+	rowValues = [0] * center[1] + [4] + [2] * center[1]
+
+	counts = Counter(map(add, map(columnValues.__getitem__, xs), map(rowValues.__getitem__, ys)))
+
+	return tuple(counts[q] for q in range(4))
+
+def CountDensity(xs, ys, gridSize, cellSize = 1):
+	# Number of robots in each cellSize x cellSize block of the grid, as a flat list in reading order.
+	# Blocks on the right & bottom edges may be partly off the grid.
+	columns = -(-gridSize[0] // cellSize)
+	rows = -(-gridSize[1] // cellSize)
+
+	counts = Counter(map(add, map(cellSize.__rfloordiv__, xs), map(columns.__mul__, map(cellSize.__rfloordiv__, ys))))
+
+	density = [0] * (columns * rows)
+	for cell, count in counts.items():
+		density[cell] = count
+
+	return density
+
 def SimulateMovement(gridSize, robots, seconds = 1):
 	# As the robots move in constant, unchanging velocity, we can simply multiple & apply velocity.
 	# Robots will likely go over the edge - As we're meant to loop them round in those cases, we can
@@ -40,7 +113,10 @@ def SimulateMovement(gridSize, robots, seconds = 1):
 		robot["px"] = (robot["px"] + robot["vx"] * seconds) % gridSize[0]
 		robot["py"] = (robot["py"] + robot["vy"] * seconds) % gridSize[1]
 
-def PartA(inputFile, gridSize):
+def PartA(inputFile, gridSize, vectorised = False):
+	if vectorised:
+		return prod(CountQuadrants(*PositionsAt(ParseSwarm(inputFile), gridSize, 100), gridSize))
+
 	robots = list(Parse(inputFile))
 	
 	# Simulate for 100 turns.
@@ -92,14 +168,74 @@ def PartB(inputFile, gridSize):
 	# Return whatever i ended up as for the answer.  
 	return i
 
+def ScoreVariance(positions):
+	# Spread of the positions along an axis. Lower means more bunched up.
+	# This is n^2 times the variance, which ranks the same but doesn't need any division.
+	return len(positions) * sum(map(mul, positions, positions)) - sum(positions) ** 2
+
+def ScoreCollisions(positions):
+	# Number of pairs of robots sharing a row/column, negated so that lower means more bunched up.
+	return -sum(c * (c - 1) // 2 for c in Counter(positions).values())
+
+AXIS_SCORES = {
+	"variance": ScoreVariance,
+	"collisions": ScoreCollisions
+}
+
+def FindBestOffset(positions, velocities, size, score):
+	# Steps an axis through one full period, and returns the offset with the lowest score. After 
+	# `size` seconds every robot is back where it started, so there's no need to look any further.
+	best = None
+	for offset in range(size):
+		result = score(positions)
+		if best is None or result < best[0]:
+			best = (result, offset)
+
+		positions = [p % size for p in map(add, positions, velocities)]
+
+	return best[1]
+
+def CombineCongruences(a, m, b, n):
+	# Chinese Remainder Theorem: Finds t where t = a (mod m) and t = b (mod n). Returns t along with the
+	# period it repeats over, or None if there's no such t. The moduli don't need to be coprime.
+	divisor = gcd(m, n)
+	if (b - a) % divisor != 0:
+		return None
+
+	lcm = m // divisor * n
+	k = (b - a) // divisor * pow(m // divisor, -1, n // divisor) % (n // divisor)
+
+	return (a + k * m) % lcm, lcm
+
+def PartBPeriodic(inputFile, gridSize, statistic = "variance"):
+	swarm = ParseSwarm(inputFile)
+	score = AXIS_SCORES[statistic]
+
+	offsetX = FindBestOffset(list(swarm["px"]), swarm["vx"], gridSize[0], score)
+	offsetY = FindBestOffset(list(swarm["py"]), swarm["vy"], gridSize[1], score)
+
+	combined = CombineCongruences(offsetX, gridSize[0], offsetY, gridSize[1])
+	assert combined is not None
+
+	# Second 0 is the starting layout, which PartB() never counts - So go round one more period.
+	seconds, period = combined
+	if seconds == 0:
+		seconds = period
+
+	# Make sure the robots really are all on their own spots by then.
+	assert max(CountDensity(*PositionsAt(swarm, gridSize, seconds), gridSize)) == 1
+
+	return seconds
+
 testCases = [
 	("examples/Day14_Example.txt", (11, 7), 12),
 	("inputs/Day14_input.txt", (101, 103), 216027840)
 ]
 @pytest.mark.parametrize(	"inputPath, gridSize, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, gridSize, expected):
-	assert PartA(inputPath, gridSize) == expected
+@pytest.mark.parametrize("vectorised", [False, True])
+def test_part_a(inputPath, gridSize, expected, vectorised):
+	assert PartA(inputPath, gridSize, vectorised = vectorised) == expected
 
 testCases = [
 	("inputs/Day14_input.txt", (101, 103), 6876)
@@ -109,5 +245,61 @@ testCases = [
 def test_part_b(inputPath, gridSize, expected):
 	assert PartB(inputPath, gridSize) == expected
 
+@pytest.mark.parametrize("inputPath, gridSize, expected", testCases, 
+							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
+@pytest.mark.parametrize("statistic", AXIS_SCORES.keys())
+def test_part_b_periodic(inputPath, gridSize, expected, statistic):
+	assert PartBPeriodic(inputPath, gridSize, statistic) == expected
+
+def test_swarm():
+	gridSize = (11, 7)
+	swarm = ParseSwarm("examples/Day14_Example.txt")
+
+	# Jumping about in time should land the swarm in the same places as moving each robot in turn.
+	for seconds, xs, ys in SimulateSwarm(swarm, gridSize, [0, 100, 1, 37, 5]):
+		robots = list(Parse("examples/Day14_Example.txt"))
+		SimulateMovement(gridSize, robots, seconds)
+
+		assert list(xs) == [r["px"] for r in robots]
+		assert list(ys) == [r["py"] for r in robots]
+
+		quadrants = CountQuadrants(xs, ys, gridSize)
+		for q, (right, bottom) in enumerate([(False, False), (True, False), (False, True), (True, True)]):
+			assert quadrants[q] == sum(
+				1 for r in robots 
+				if r["px"] != 5 and r["py"] != 3 and (r["px"] > 5, r["py"] > 3) == (right, bottom)
+			)
+
+		for cellSize in [1, 2, 4]:
+			density = CountDensity(xs, ys, gridSize, cellSize)
+			assert sum(density) == len(robots)
+			assert all(
+				density[(y // cellSize) * -(-gridSize[0] // cellSize) + x // cellSize] > 0 
+				for x, y in zip(xs, ys)
+			)
+
+def test_combine_congruences():
+	assert CombineCongruences(2, 3, 3, 5) == (8, 15)
+	assert CombineCongruences(1, 4, 3, 6) == (9, 12)
+	assert CombineCongruences(1, 4, 2, 6) is None
+
+@pytest.mark.parametrize("statistic", AXIS_SCORES.keys())
+def test_hidden_picture(tmp_path, statistic):
+	# Pack robots into a block at a known second, then wind back the clock to get their starting spots.
+	gridSize, frame = (101, 103), 4321
+	spots = [(x, y) for x in range(35, 65) for y in range(40, 60)]
+
+	rng = random.Random(14)
+
+	lines = []
+	for x, y in spots:
+		vx, vy = rng.randrange(-100, 101), rng.randrange(-102, 103)
+		lines.append(f"p={(x - vx * frame) % gridSize[0]},{(y - vy * frame) % gridSize[1]} v={vx},{vy}")
+
+	inputPath = tmp_path / "robots.txt"
+	inputPath.write_text("\n".join(lines))
+
+	assert PartBPeriodic(inputPath, gridSize, statistic) == PartB(inputPath, gridSize) == frame
+
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
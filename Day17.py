@@ -1,5 +1,7 @@
 import pytest
 import re
+from itertools import compress
+from operator import rshift, xor
 
 '''
 	APPROACH:
@@ -38,6 +40,26 @@ import re
 				- Don't reset n between instructions.
 			Once all instructions have been processed, n should be the lowest n required for recreating 
 			the original program string.
+
+		Compiled (compiled = True):
+			Rather than working out what each opcode means every time it's hit, translate the whole 
+			program into Python source once (see GenerateSource()). Operands are worked out up front, 
+			registers are kept as local variables, and the jumps become a loop. The compiled program is 
+			cached against the program itself, so running it millions of times over in Part 2 only pays 
+			for compiling once.
+
+		Part 2, backtracking (backtracking = True):
+			The program eats A three bits at a time, one octal digit per output, with the last output 
+			coming from the top digit. So build A up one octal digit at a time from the top, trying 
+			only the 8 possible digits for each output from the end, and going deeper on any that match.
+			Unlike the scan above, a digit that leads nowhere can be backed out of in favour of the 
+			next one. Trying digits smallest first means solutions come out smallest first.
+
+		Batched (batched = True):
+			Run a whole batch of values for register A through the program together (see RunBatch()), 
+			one instruction at a time across every lane. The digit search then goes a level at a time: 
+			every surviving prefix with each of its 8 digits, as one batch. Lanes are dropped as soon as
+			they output something that doesn't match, so most of a batch is gone after an output or two.
 '''
 
 def Parse(inputFile):
@@ -113,12 +135,243 @@ def GenerateProgram(payload, registers = None):
 
 		caret += jump
 
-def PartA(inputFile):
-	return ",".join([str(n) for n in GenerateProgram(Parse(inputFile))]) 
+# Source for the combo operand of each literal operand. 7 isn't valid, so has no source.
+COMBO_SOURCES = ["0", "1", "2", "3", "a", "b", "c", None]
+
+# Source for each opcode other than jnz (which is handled by the blocks around it).
+# Nothing's ever negative, so & 7 does the job of % 8.
+INSTRUCTION_SOURCES = {
+	0: "a >>= {combo}",			# adv
+	1: "b ^= {literal}",		# bxl
+	2: "b = {combo} & 7",		# bst
+	4: "b ^= c",				# bxc
+	5: "yield {combo} & 7",		# out
+	6: "b = a >> {combo}",		# bdv
+	7: "c = a >> {combo}"		# cdv
+}
+
+def GenerateSource(program):
+	# Turns a program into the source of a Python generator, Run(a, b, c), that yields the same 
+	# output as GenerateProgram(). 
+	# The program is split into blocks, each running straight through until a jump or the end. A 
+	# block starts at the beginning, at any jump target, and straight after any jump.
+	blocks = {}
+	pending = [0]
+	while len(pending) > 0:
+		start = pending.pop()
+		if start in blocks:
+			continue
+
+		lines = []
+		caret = start
+		while True:
+			# Running off the end of the program halts it. 
+			if caret + 1 >= len(program):
+				lines.append("return")
+				break
+
+			opcode, operand = program[caret:caret + 2]
+			if opcode == 3:
+				# A jump to itself doesn't go anywhere, same as in GenerateProgram().
+				if operand != caret:
+					lines += ["if a != 0:", f"\tblock = {operand}", "\tcontinue"]
+					pending.append(operand)
+
+				# Whatever comes after a jump is a block of its own.
+				lines += [f"block = {caret + 2}", "continue"]
+				pending.append(caret + 2)
+				break
+
+			if COMBO_SOURCES[operand] is None and opcode not in (1, 4):
+				lines.append(f"raise AssertionError('Invalid combo operand {operand}')")
+			else:
+				lines.append(INSTRUCTION_SOURCES[opcode].format(combo = COMBO_SOURCES[operand], literal = operand))
+
+			caret += 2
+
+		blocks[start] = lines
+
+	source = ["def Run(a, b, c):", "\tblock = 0", "\twhile True:"]
+	for start, lines in sorted(blocks.items()):
+		source.append(f"\t\tif block == {start}:")
+		source += [f"\t\t\t{line}" for line in lines]
+
+	# Never reached, but it keeps Run() a generator for programs that don't output anything.
+	source.append("\tyield from ()")
+
+	return "\n".join(source) + "\n"
+
+# Compiled programs, against the program they came from.
+COMPILED_PROGRAMS = {}
+
+def CompileProgram(program):
+	key = tuple(program)
+	if key not in COMPILED_PROGRAMS:
+		namespace = {}
+		exec(GenerateSource(program), namespace)
+		COMPILED_PROGRAMS[key] = namespace["Run"]
+
+	return COMPILED_PROGRAMS[key]
+
+def RunProgram(payload, registers = None, compiled = False):
+	# Runs a program through either the interpreter or its compiled version.
+	if registers is None:
+		registers = payload["registers"]
+
+	if compiled:
+		return CompileProgram(payload["program"])(*registers)
+
+	return GenerateProgram(payload, registers)
+
+def GetBatchComboOperand(operand, a, b, c):
+	# Same as GetComboOperand(), but for a whole batch of lanes.
+	if 0 <= operand <= 3:
+		return [operand] * len(a)
+
+	assert operand <= 6
+
+	return (a, b, c)[operand - 4]
+
+def RunBatch(program, registersA, b = 0, c = 0, expected = None):
+	# Runs the program for each of the given values of register A in lockstep. Each register is a list
+	# across all the lanes, so each instruction is just a map() over those lists.
+	# Lanes that halt are dropped from the batch. If `expected` is given, so are lanes as soon as they 
+	# output something that doesn't match it. Returns each lane's output, up to wherever it stopped.
+	outputs = [[] for _ in registersA]
+
+	# Outputs are kept as columns (one list of values across the lanes for each output), and are only 
+	# handed out lane by lane once those lanes are dropped.
+	def Drop(lanes, columns):
+		for lane, values in zip(lanes, map(list, zip(*columns))):
+			outputs[lane] = values
+
+	def Select(state, selected):
+		lanes, a, b, c, columns = state
+		return (
+			*(list(compress(r, selected)) for r in (lanes, a, b, c)), 
+			[list(compress(column, selected)) for column in columns]
+		)
+
+	# Lanes only stay in lockstep until a jump goes one way for some and the other way for the rest. 
+	# When that happens, the batch splits into groups, each with its own caret.
+	numLanes = len(registersA)
+	groups = [(0, (list(range(numLanes)), list(registersA), [b] * numLanes, [c] * numLanes, []))]
+
+	while len(groups) > 0:
+		caret, (lanes, a, b, c, columns) = groups.pop()
+
+		while len(lanes) > 0 and caret + 1 < len(program):
+			opcode, operand = program[caret:caret + 2]
+			jump = 2
 
-def PartB(inputFile):
+			if opcode == 0:	# adv (combo)
+				a = list(map(rshift, a, GetBatchComboOperand(operand, a, b, c)))
+			elif opcode == 1: # bxl (literal)
+				b = list(map(operand.__xor__, b))
+			elif opcode == 2: # bst (combo)
+				b = list(map((7).__and__, GetBatchComboOperand(operand, a, b, c)))
+			elif opcode == 3: # jnz (literal)
+				# As with GenerateProgram(), a jump to itself doesn't go anywhere.
+				jumping = list(map(bool, a))
+				if operand != caret and all(jumping):
+					caret, jump = operand, 0
+				elif operand != caret and any(jumping):
+					# Split the lanes that jump off into a group of their own, and carry on with the rest.
+					state = (lanes, a, b, c, columns)
+					groups.append((operand, Select(state, jumping)))
+					lanes, a, b, c, columns = Select(state, [not j for j in jumping])
+			elif opcode == 4: # bxc (unused)
+				b = list(map(xor, b, c))
+			elif opcode == 5: # out (combo)
+				values = list(map((7).__and__, GetBatchComboOperand(operand, a, b, c)))
+				columns.append(values)
+
+				# Every lane in a group has output the same number of values, so they're all being 
+				# checked against the same expected value.
+				if expected is not None:
+					position = len(columns) - 1
+					matching = [position < len(expected) and value == expected[position] for value in values]
+
+					if not all(matching):
+						# The dropped lanes only need their outputs kept, not their registers.
+						mismatched = [not m for m in matching]
+						Drop(list(compress(lanes, mismatched)), [list(compress(column, mismatched)) for column in columns])
+						lanes, a, b, c, columns = Select((lanes, a, b, c, columns), matching)
+			elif opcode == 6: # bdv (combo)
+				b = list(map(rshift, a, GetBatchComboOperand(operand, a, b, c)))
+			elif opcode == 7: # cdv (combo)
+				c = list(map(rshift, a, GetBatchComboOperand(operand, a, b, c)))
+
+			caret += jump
+
+		Drop(lanes, columns)
+
+	return outputs
+
+def ScanRegisterA(payload, start, stop, batchSize = 4096):
+	# Brute force: Yields every value of register A in [start, stop) that makes the program output 
+	# itself, a batch at a time.
+	program = payload["program"]
+
+	for batchStart in range(start, stop, batchSize):
+		candidates = range(batchStart, min(batchStart + batchSize, stop))
+		outputs = RunBatch(program, candidates, *payload["registers"][1:], expected = program)
+
+		yield from (a for a, output in zip(candidates, outputs) if output == program)
+
+def SearchRegisterABatched(payload):
+	# The same search as SearchRegisterA(), but a level at a time: Every prefix that's survived so far, 
+	# with each of the 8 digits after it, is run as a single batch. Returns every solution, smallest 
+	# first (as the prefixes are kept in order, and so are the digits after each).
+	program = payload["program"]
+
+	prefixes = [0]
+	for position in range(len(program), 0, -1):
+		reference = program[position - 1:]
+		candidates = [(prefix << 3) | digit for prefix in prefixes for digit in range(8)]
+
+		outputs = RunBatch(program, candidates, *payload["registers"][1:], expected = reference)
+		prefixes = [a for a, output in zip(candidates, outputs) if output == reference]
+
+	return prefixes
+
+def SearchRegisterA(payload, compiled = False, prefix = 0, position = None):
+	# Yields every value of register A (built on the given prefix) that makes the program output 
+	# itself, smallest first. Every candidate has to reproduce the program from `position` onwards.
+	program = payload["program"]
+	if position is None:
+		position = len(program)
+
+	if position == 0:
+		yield prefix
+		return
+
+	reference = program[position - 1:]
+	for digit in range(8):
+		candidate = (prefix << 3) | digit
+
+		# Only go further down a digit if it outputs exactly the end of the program so far.
+		output = list(RunProgram(payload, [candidate, *payload["registers"][1:]], compiled))
+		if output == reference:
+			yield from SearchRegisterA(payload, compiled, candidate, position - 1)
+
+def FindAllRegisterA(inputFile, compiled = False):
+	return list(SearchRegisterA(Parse(inputFile), compiled))
+
+def PartA(inputFile, compiled = False):
+	return ",".join([str(n) for n in RunProgram(Parse(inputFile), compiled = compiled)]) 
+
+def PartB(inputFile, compiled = False, backtracking = False, batched = False):
 	payload = Parse(inputFile)
 
+	if batched:
+		solutions = SearchRegisterABatched(payload)
+		return next(iter(solutions), None)
+
+	# The first solution found is the smallest. None if there aren't any.
+	if backtracking:
+		return next(SearchRegisterA(payload, compiled), None)
+
 	n = 0
 	for i in range(len(payload["program"]), 0, -1):
 		# Observed when running the test & input cases manually is that the length of the resulting 
@@ -137,7 +390,7 @@ def PartB(inputFile):
 		# Consequently, as soon as it hits a value that doesn't match the reference, it can bail out 
 		# much earlier and move to the next attempt instead of calculating the rest. 
 		while any(a != b for a, b in zip(
-			GenerateProgram(payload, [n, *payload["registers"][1:]]), 
+			RunProgram(payload, [n, *payload["registers"][1:]], compiled), 
 			reference
 		)):
 			n += 1
@@ -150,8 +403,9 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_a(inputPath, expected):
-	assert PartA(inputPath) == expected
+@pytest.mark.parametrize("compiled", [False, True])
+def test_part_a(inputPath, expected, compiled):
+	assert PartA(inputPath, compiled) == expected
 
 testCases = [
 	("examples/Day17_ExampleB.txt", 117440),
@@ -159,8 +413,58 @@ testCases = [
 ]
 @pytest.mark.parametrize(	"inputPath, expected", testCases, 
 							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
-def test_part_b(inputPath, expected):
-	assert PartB(inputPath) == expected
+@pytest.mark.parametrize("compiled", [False, True])
+@pytest.mark.parametrize("backtracking", [False, True])
+def test_part_b(inputPath, expected, compiled, backtracking):
+	assert PartB(inputPath, compiled, backtracking) == expected
+
+@pytest.mark.parametrize("inputPath, expected", testCases, 
+							ids = [t[0].split("_")[-1].split(".")[0] for t in testCases])
+def test_part_b_batched(inputPath, expected):
+	assert PartB(inputPath, batched = True) == expected
+
+def test_all_register_a():
+	payload = Parse("examples/Day17_ExampleB.txt")
+	solutions = FindAllRegisterA("examples/Day17_ExampleB.txt")
+
+	assert solutions[0] == 117440
+	assert solutions == sorted(solutions)
+	assert all(list(GenerateProgram(payload, [a, 0, 0])) == payload["program"] for a in solutions)
+
+	assert SearchRegisterABatched(payload) == solutions
+	assert list(ScanRegisterA(payload, 0, 1 << 18, batchSize = 1000)) == solutions
+
+programCases = [
+	([0, 1, 5, 4, 3, 0], [729, 0, 0]),
+	([2, 4, 1, 3, 7, 5, 4, 0, 1, 5, 0, 3, 5, 5, 3, 0], [236539226447469, 0, 0]),
+	([5, 4, 0, 1, 3, 6, 5, 5, 3, 0, 5, 6], [12345, 1, 2]),		# Jumps past a block of its own
+	([5, 4, 3, 2, 0, 1, 5, 4], [99, 0, 0]),						# Jumps to itself
+	([0, 3, 3, 1, 1, 5, 4, 6, 5], [70, 0, 0]),					# Jumps off the even steps
+	([5, 4, 3, 9], [6, 0, 0]),									# Jumps off the end
+]
+@pytest.mark.parametrize("program, registers", programCases)
+def test_compile(program, registers):
+	payload = {"registers": registers, "program": program}
+
+	assert list(RunProgram(payload, list(registers), compiled = True)) == list(GenerateProgram(payload, list(registers)))
+	assert CompileProgram(program) is CompileProgram(list(program))
+
+@pytest.mark.parametrize("program, registers", programCases)
+def test_run_batch(program, registers):
+	payload = {"registers": registers, "program": program}
+	values = [registers[0] + i for i in range(128)]
+
+	outputs = RunBatch(program, values, *registers[1:])
+	assert outputs == [list(GenerateProgram(payload, [a, *registers[1:]])) for a in values]
+
+	# With an expected output, every lane should stop at its first mismatch.
+	expected = outputs[len(outputs) // 2]
+	for output, culled in zip(outputs, RunBatch(program, values, *registers[1:], expected = expected)):
+		stop = next((i for i, x in enumerate(output) if i >= len(expected) or x != expected[i]), None)
+		if stop is None:
+			assert culled == output
+		else:
+			assert culled == output[:stop + 1]
 
 if __name__ == "__main__":
 	pytest.main(["-v", __file__])
@@ -0,0 +1,325 @@
+import argparse
+import glob
+import importlib
+import inspect
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from generate_inputs import GENERATORS, GenerateInput
+from statistics import median
+
+'''
+	Times every DayNN.py module's entry points against its puzzle input (or the examples).
+
+	Each module is discovered by filename, then each of its registered parts is run as follows:
+		- The part's parser on its own (where it can be), with generators fully drained so lazy parsers 
+		  are timed fairly.
+		- The part's entry point (Solve/PartA/PartB), which includes its own call to the parser.
+	Both are repeated a number of times to get min/median/p95, then run once more under tracemalloc
+	to get peak memory. Tracing is kept out of the timed runs as it slows allocations considerably.
+	tracemalloc only sees the current process, so parts that farm work out to a process pool only 
+	report the parent's peak (marked as such in the table).
+
+	With --synthetic, inputs are generated at the given scale instead (see generate_inputs.py), which
+	is handy for seeing how each day copes as the input grows.
+
+	Run from the repository root, same as the tests:
+		python tools/benchmark.py [--examples | --synthetic SCALE] [--repeat N] [--json results.json] [Day06 Day09 ...]
+'''
+
+# What to run for each day. Each part is listed as (label, entry point, parser, kwargs, example).
+# The parser is whichever function the entry point actually parses its input with, so that the Parse
+# column reflects the same work. It's passed whichever of the part's kwargs it accepts (e.g. Day03's 
+# chunkSize), and is None when the parsing happens somewhere it can't be timed on its own (e.g. in 
+# worker processes), in which case the Parse column is left empty.
+# The example is (path, kwargs) to use with --examples, or None if the part has no sensible example
+# to run against (e.g. Day14's Part B never resolves on the tiny example grid).
+BENCHMARKS = {
+	"Day01": [
+		("PartA", "Solve", "Parse", {}, ("examples/Day01_Example.txt", {})),
+		("PartB", "Solve", "Parse", {"combine": True}, ("examples/Day01_Example.txt", {"combine": True})),
+		("PartA (vectorised)", "Solve", "ParseColumns", {"vectorised": True}, ("examples/Day01_Example.txt", {"vectorised": True})),
+		("PartB (vectorised)", "Solve", "ParseColumns", {"combine": True, "vectorised": True}, ("examples/Day01_Example.txt", {"combine": True, "vectorised": True})),
+	],
+	"Day02": [
+		("PartA", "Solve", "Parse", {}, ("examples/Day02_Example.txt", {})),
+		("PartB", "Solve", "Parse", {"maxTolerance": 1}, ("examples/Day02_Example.txt", {"maxTolerance": 1})),
+		("PartA (batched)", "Solve", "ParseBatches", {"batched": True}, ("examples/Day02_Example.txt", {"batched": True})),
+		("PartB (batched)", "Solve", "ParseBatches", {"maxTolerance": 1, "batched": True}, ("examples/Day02_Example.txt", {"maxTolerance": 1, "batched": True})),
+	],
+	"Day03": [
+		("PartA", "Solve", "Parse", {}, ("examples/Day03_ExampleA.txt", {})),
+		("PartB", "Solve", "Parse", {"toggle": True}, ("examples/Day03_ExampleB.txt", {"toggle": True})),
+		("PartA (streaming)", "Solve", "StreamOperations", {"chunkSize": 1 << 20}, ("examples/Day03_ExampleA.txt", {"chunkSize": 1 << 20})),
+		("PartB (streaming)", "Solve", "StreamOperations", {"toggle": True, "chunkSize": 1 << 20}, ("examples/Day03_ExampleB.txt", {"toggle": True, "chunkSize": 1 << 20})),
+	],
+	"Day04": [
+		("PartA", "PartA", "Parse", {}, ("examples/Day04_ExampleB.txt", {})),
+		("PartB", "PartB", "Parse", {}, ("examples/Day04_ExampleB.txt", {})),
+		("PartA (vectorised)", "PartA", "ParseMasks", {"vectorised": True}, ("examples/Day04_ExampleB.txt", {"vectorised": True})),
+		("PartB (vectorised)", "PartB", "ParseMasks", {"vectorised": True}, ("examples/Day04_ExampleB.txt", {"vectorised": True})),
+	],
+	"Day05": [
+		("PartA", "Solve", "Parse", {}, ("examples/Day05_Example.txt", {})),
+		("PartB", "Solve", "Parse", {"fixIncorrects": True}, ("examples/Day05_Example.txt", {"fixIncorrects": True})),
+		("PartA (indexed)", "Solve", "Parse", {"indexed": True}, ("examples/Day05_Example.txt", {"indexed": True})),
+		("PartB (indexed)", "Solve", "Parse", {"fixIncorrects": True, "indexed": True}, ("examples/Day05_Example.txt", {"fixIncorrects": True, "indexed": True})),
+	],
+	"Day06": [
+		("PartA", "Solve", "Parse", {}, ("examples/Day06_Example.txt", {})),
+		("PartB", "Solve", "Parse", {"interfere": True}, ("examples/Day06_Example.txt", {"interfere": True})),
+		("PartA (jumping)", "Solve", "Parse", {"jumping": True}, ("examples/Day06_Example.txt", {"jumping": True})),
+		("PartB (jumping)", "Solve", "Parse", {"interfere": True, "jumping": True}, ("examples/Day06_Example.txt", {"interfere": True, "jumping": True})),
+		("PartB (parallel)", "Solve", "Parse", {"interfere": True, "workers": os.cpu_count()}, ("examples/Day06_Example.txt", {"interfere": True, "workers": os.cpu_count()})),
+	],
+	"Day07": [
+		("PartA", "Solve", "Parse", {}, ("examples/Day07_ExampleA.txt", {})),
+		("PartB", "Solve", "Parse", {"concatenate": True}, ("examples/Day07_ExampleB.txt", {"concatenate": True})),
+		("PartA (backwards)", "Solve", "Parse", {"backwards": True}, ("examples/Day07_ExampleA.txt", {"backwards": True})),
+		("PartB (backwards)", "Solve", "Parse", {"concatenate": True, "backwards": True}, ("examples/Day07_ExampleB.txt", {"concatenate": True, "backwards": True})),
+		("PartB (parallel)", "Solve", None, {"concatenate": True, "workers": os.cpu_count()}, ("examples/Day07_ExampleB.txt", {"concatenate": True, "workers": os.cpu_count()})),
+	],
+	"Day08": [
+		("PartA", "Solve", "Parse", {"limited": True}, ("examples/Day08_ExampleA.txt", {"limited": True})),
+		("PartB", "Solve", "Parse", {}, ("examples/Day08_ExampleA.txt", {})),
+		("PartA (vectorised)", "Solve", "Parse", {"limited": True, "vectorised": True}, ("examples/Day08_ExampleA.txt", {"limited": True, "vectorised": True})),
+		("PartB (vectorised)", "Solve", "Parse", {"vectorised": True}, ("examples/Day08_ExampleA.txt", {"vectorised": True})),
+	],
+	"Day09": [
+		("PartA", "Solve", "Parse", {"contiguous": False}, ("examples/Day09_Example.txt", {"contiguous": False})),
+		("PartB", "Solve", "Parse", {}, ("examples/Day09_Example.txt", {})),
+		("PartA (indexed)", "Solve", "ParseArrays", {"contiguous": False, "indexed": True}, ("examples/Day09_Example.txt", {"contiguous": False, "indexed": True})),
+		("PartB (indexed)", "Solve", "ParseArrays", {"indexed": True}, ("examples/Day09_Example.txt", {"indexed": True})),
+	],
+	"Day10": [
+		("PartA", "Solve", "Parse", {}, ("examples/Day10_ExampleE.txt", {})),
+		("PartB", "Solve", "Parse", {"countDistinctRoutes": True}, ("examples/Day10_ExampleE.txt", {"countDistinctRoutes": True})),
+		("PartA (layered)", "Solve", "ParseLayers", {"layered": True}, ("examples/Day10_ExampleE.txt", {"layered": True})),
+		("PartB (layered)", "Solve", "ParseLayers", {"countDistinctRoutes": True, "layered": True}, ("examples/Day10_ExampleE.txt", {"countDistinctRoutes": True, "layered": True})),
+	],
+	"Day11": [
+		("PartA", "Solve", "Parse", {"numBlinks": 25}, ("examples/Day11_ExampleB.txt", {"numBlinks": 25})),
+		("PartB", "Solve", "Parse", {"numBlinks": 75}, ("examples/Day11_ExampleB.txt", {"numBlinks": 75})),
+		("PartB (transitions)", "Solve", "Parse", {"numBlinks": 75, "transitions": True}, ("examples/Day11_ExampleB.txt", {"numBlinks": 75, "transitions": True})),
+		("Deep (transitions)", "Solve", "Parse", {"numBlinks": 1000000, "transitions": True, "modulus": 1000000007}, ("examples/Day11_ExampleB.txt", {"numBlinks": 1000000, "transitions": True, "modulus": 1000000007})),
+		("Series (memoised)", "SolveSeries", "Parse", {"maxBlinks": 75}, ("examples/Day11_ExampleB.txt", {"maxBlinks": 75})),
+		("Series (memoised, warm)", "SolveSeries", "Parse", {"maxBlinks": 75}, ("examples/Day11_ExampleB.txt", {"maxBlinks": 75})),
+	],
+	"Day13": [
+		("PartA", "Solve", "Parse", {}, ("examples/Day13_Example.txt", {})),
+		("PartB", "Solve", "Parse", {"handicap": 10000000000000}, ("examples/Day13_Example.txt", {"handicap": 10000000000000})),
+		("PartA (batched)", "Solve", "ParseBatch", {"batched": True}, ("examples/Day13_Example.txt", {"batched": True})),
+		("PartB (batched)", "Solve", "ParseBatch", {"handicap": 10000000000000, "batched": True}, ("examples/Day13_Example.txt", {"handicap": 10000000000000, "batched": True})),
+	],
+	"Day14": [
+		("PartA", "PartA", "Parse", {"gridSize": (101, 103)}, ("examples/Day14_Example.txt", {"gridSize": (11, 7)})),
+		("PartA (vectorised)", "PartA", "ParseSwarm", {"gridSize": (101, 103), "vectorised": True}, ("examples/Day14_Example.txt", {"gridSize": (11, 7), "vectorised": True})),
+		("PartB", "PartB", "Parse", {"gridSize": (101, 103)}, None),
+		("PartB (periodic)", "PartBPeriodic", "ParseSwarm", {"gridSize": (101, 103)}, None),
+	],
+	"Day17": [
+		("PartA", "PartA", "Parse", {}, ("examples/Day17_ExampleA.txt", {})),
+		("PartB", "PartB", "Parse", {}, ("examples/Day17_ExampleB.txt", {})),
+		("PartA (compiled)", "PartA", "Parse", {"compiled": True}, ("examples/Day17_ExampleA.txt", {"compiled": True})),
+		("PartB (compiled)", "PartB", "Parse", {"compiled": True}, ("examples/Day17_ExampleB.txt", {"compiled": True})),
+		("PartB (backtracking)", "PartB", "Parse", {"compiled": True, "backtracking": True}, ("examples/Day17_ExampleB.txt", {"compiled": True, "backtracking": True})),
+		("PartB (batched)", "PartB", "Parse", {"batched": True}, ("examples/Day17_ExampleB.txt", {"batched": True})),
+	],
+}
+
+# Parts that can't be run against generated inputs. Day17's Part B is looking for a program that
+# outputs itself, which a randomly generated program has no guarantee of.
+SYNTHETIC_SKIP = {("Day17", "PartB"), ("Day17", "PartB (compiled)"), ("Day17", "PartB (backtracking)"), ("Day17", "PartB (batched)")}
+
+# Functions to call before every run of a part's entry point, timed or traced, named by the part.
+# Day11's stone memo outlives each call, so without clearing it only the first run would be cold. The 
+# warm row deliberately has no setup: It runs straight after the cold one, against a filled memo.
+SETUP = {("Day11", "Series (memoised)"): "ClearStoneMemo"}
+
+# Parts that do their work in a process pool. Their workers' allocations are invisible to tracemalloc,
+# so the peak memory reported is only the parent's.
+PARENT_ONLY_MEMORY = {("Day06", "PartB (parallel)"), ("Day07", "PartB (parallel)")}
+
+def DiscoverDays(rootDir):
+	# Only the DayNN.py files are solutions: Anything else in the root is left alone.
+	dayRegex = re.compile(r"^(Day\d{2})\.py$")
+
+	for path in sorted(glob.glob(os.path.join(rootDir, "Day*.py"))):
+		match = dayRegex.match(os.path.basename(path))
+		if match is not None:
+			yield match.group(1)
+
+def Drain(result):
+	# Some Parse() functions return their results directly, others are generators. The latter need
+	# to be run to completion, otherwise we'd only be timing the creation of the generator.
+	if inspect.isgenerator(result):
+		for _ in result:
+			pass
+
+def NoSetup():
+	pass
+
+def TimeCall(func, repeat, setup = NoSetup):
+	timings = []
+
+	for _ in range(repeat):
+		setup()
+		start = time.perf_counter()
+		Drain(func())
+		timings.append(time.perf_counter() - start)
+
+	return timings
+
+def PeakMemory(func, setup = NoSetup):
+	setup()
+	tracemalloc.start()
+	try:
+		Drain(func())
+		_, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	return peak
+
+def Summarise(timings):
+	ordered = sorted(timings)
+
+	# Nearest-rank percentile: Good enough for the handful of runs we take.
+	p95 = ordered[min(len(ordered) - 1, max(0, -(-95 * len(ordered) // 100) - 1))]
+
+	return {
+		"min": ordered[0],
+		"median": median(ordered),
+		"p95": p95,
+		"runs": len(ordered)
+	}
+
+def BenchmarkPart(module, entryPoint, parser, inputPath, kwargs, repeat, setup = None):
+	solve = getattr(module, entryPoint)
+	prepare = NoSetup if setup is None else getattr(module, setup)
+
+	result = {
+		"input": inputPath,
+		"entry": entryPoint,
+		"parser": parser,
+		"setup": setup,
+		"kwargs": dict(kwargs),
+		"parse": None,
+		"solve": Summarise(TimeCall(lambda: solve(inputPath, **kwargs), repeat, prepare)),
+		"parsePeakBytes": None,
+		"solvePeakBytes": PeakMemory(lambda: solve(inputPath, **kwargs), prepare)
+	}
+
+	if parser is not None:
+		parse = getattr(module, parser)
+		parameters = inspect.signature(parse).parameters
+		parseKwargs = {k: v for k, v in kwargs.items() if k in parameters}
+
+		result["parse"] = Summarise(TimeCall(lambda: parse(inputPath, **parseKwargs), repeat))
+		result["parsePeakBytes"] = PeakMemory(lambda: parse(inputPath, **parseKwargs))
+
+	return result
+
+def RunBenchmarks(days, useExamples = False, repeat = 5, syntheticScale = None):
+	results = []
+
+	with tempfile.TemporaryDirectory() as tempDir:
+		for day in days:
+			results.extend(RunDayBenchmarks(day, tempDir, useExamples, repeat, syntheticScale))
+
+	return results
+
+def RunDayBenchmarks(day, tempDir, useExamples, repeat, syntheticScale):
+	module = importlib.import_module(day)
+
+	syntheticPath = None
+	syntheticKwargs = {}
+	if syntheticScale is not None and day in GENERATORS:
+		syntheticPath = os.path.join(tempDir, f"{day}_x{syntheticScale}.txt")
+		syntheticKwargs = GenerateInput(day, syntheticPath, scale = syntheticScale)
+
+	results = []
+	for label, entryPoint, parser, kwargs, example in BENCHMARKS.get(day, []):
+		inputPath = f"inputs/{day}_input.txt"
+		if useExamples:
+			if example is None:
+				continue
+			inputPath, kwargs = example
+		elif syntheticScale is not None:
+			if syntheticPath is None or (day, label) in SYNTHETIC_SKIP:
+				continue
+			inputPath, kwargs = syntheticPath, kwargs | syntheticKwargs
+
+		if not os.path.isfile(inputPath):
+			print(f"[{day} {label}] Skipped, {inputPath} not found", file = sys.stderr)
+			continue
+
+		result = BenchmarkPart(module, entryPoint, parser, inputPath, kwargs, repeat, SETUP.get((day, label)))
+		result.update({"day": day, "part": label, "parentOnlyMemory": (day, label) in PARENT_ONLY_MEMORY})
+		results.append(result)
+
+	return results
+
+def FormatTable(results):
+	headers = ["Day", "Part", "Parse (med)", "Solve (min)", "Solve (med)", "Solve (p95)", "Peak Mem"]
+	rows = []
+
+	for r in results:
+		peakMemory = f"{r['solvePeakBytes'] / 1024:.1f} KiB"
+		if r["parentOnlyMemory"]:
+			peakMemory += " (parent only)"
+
+		rows.append([
+			r["day"],
+			r["part"],
+			"-" if r["parse"] is None else f"{r['parse']['median'] * 1000:.3f} ms",
+			f"{r['solve']['min'] * 1000:.3f} ms",
+			f"{r['solve']['median'] * 1000:.3f} ms",
+			f"{r['solve']['p95'] * 1000:.3f} ms",
+			peakMemory
+		])
+
+	widths = [max(len(str(x)) for x in column) for column in zip(headers, *rows)]
+
+	lines = [" | ".join(h.ljust(w) for h, w in zip(headers, widths))]
+	lines.append("-+-".join("-" * w for w in widths))
+	for row in rows:
+		lines.append(" | ".join(c.ljust(w) for c, w in zip(row, widths)))
+
+	return "\n".join(lines)
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description = "Benchmark each day's Parse & Solve/PartA/PartB.")
+	parser.add_argument("days", nargs = "*", help = "Days to run (e.g. Day06). Defaults to all of them.")
+	sources = parser.add_mutually_exclusive_group()
+	sources.add_argument("--examples", action = "store_true", help = "Run against examples/ rather than inputs/.")
+	sources.add_argument("--synthetic", type = int, metavar = "SCALE", help = "Run against generated inputs of this scale.")
+	parser.add_argument("--repeat", type = int, default = 5, help = "Number of timed runs per call.")
+	parser.add_argument("--json", help = "Also write the results as JSON to this path.")
+	args = parser.parse_args()
+
+	if args.repeat < 1:
+		raise Exception(f"Repeat count must be positive: {args.repeat}")
+
+	# The solutions use paths relative to the repository root, so we need to be running from there.
+	rootDir = os.getcwd()
+	sys.path.insert(0, rootDir)
+
+	days = list(DiscoverDays(rootDir))
+	if any(args.days):
+		unknown = set(args.days) - set(days)
+		if any(unknown):
+			raise Exception(f"Unrecognised days: {', '.join(sorted(unknown))}")
+		days = [d for d in days if d in args.days]
+
+	results = RunBenchmarks(days, useExamples = args.examples, repeat = args.repeat, syntheticScale = args.synthetic)
+
+	print(FormatTable(results))
+
+	if args.json is not None:
+		with open(args.json, "w") as outFile:
+			json.dump(results, outFile, indent = 2)
@@ -0,0 +1,290 @@
+import argparse
+import os
+import random
+import string
+from math import isqrt
+
+'''
+	Seeded generators for synthetic puzzle inputs, for checking how each day scales with input size.
+
+	Each generator takes a random.Random and a scale factor, and returns the input text along with any
+	extra keyword arguments the day's entry points need to go with it (e.g. Day14's grid size).
+	A scale of 1 roughly matches the size of the real puzzle inputs. For grids, the scale applies to
+	the number of cells rather than the side length, so scale = 100 is a grid 10x wider & taller.
+
+	Generated inputs are built to stay solvable where a day relies on it: Day13 & Day07 include games
+	and equations with known solutions, and Day14 hides a frame where every robot is in a unique spot,
+	bunched together in a block like the real picture.
+
+	Run from the repository root:
+		python tools/generate_inputs.py Day06 [--scale N] [--seed N] [--output path]
+'''
+
+def ScaleSide(side, scale):
+	# Scales a grid's side so the number of cells scales by roughly `scale`.
+	return max(1, isqrt(int(side * side * scale)))
+
+def GenerateDay01(rng, scale):
+	numRows = 1000 * scale
+
+	left = [rng.randrange(10000, 100000) for _ in range(numRows)]
+
+	# The right column reuses values from the left often enough that Part 2 has matches to count.
+	right = [rng.random() < 0.5 and rng.choice(left) or rng.randrange(10000, 100000) for _ in range(numRows)]
+
+	return "\n".join(f"{a}   {b}" for a, b in zip(left, right)), {}
+
+def GenerateDay02(rng, scale):
+	lines = []
+
+	for _ in range(1000 * scale):
+		level = rng.randrange(1, 100)
+		direction = rng.choice([-1, 1])
+
+		report = [level]
+		for _ in range(rng.randrange(4, 8)):
+			level += direction * rng.randrange(1, 4)
+			report.append(level)
+
+		# Spoil some of the reports so that there's a mix of safe, dampened & unsafe reports.
+		for _ in range(rng.choice([0, 0, 1, 1, 2])):
+			report[rng.randrange(len(report))] += rng.randrange(-4, 5)
+
+		lines.append(" ".join(str(x) for x in report))
+
+	return "\n".join(lines), {}
+
+def GenerateDay03(rng, scale):
+	tokens = []
+
+	# Roughly matches the size & density of the real dumps.
+	for _ in range(700 * scale):
+		roll = rng.random()
+		if roll < 0.05:
+			tokens.append("do()")
+		elif roll < 0.10:
+			tokens.append("don't()")
+		elif roll < 0.15:
+			# Broken instructions that shouldn't be picked up.
+			tokens.append(rng.choice(["mul(4*", "mul ( 2 , 4 )", "mul[3,7]", "mul(1234,5)", "do_not()"]))
+		else:
+			tokens.append(f"mul({rng.randrange(1, 1000)},{rng.randrange(1, 1000)})")
+
+		tokens.append("".join(rng.choice(string.punctuation + "abcdefmulwhy ") for _ in range(rng.randrange(0, 20))))
+
+	return "".join(tokens), {}
+
+def GenerateDay04(rng, scale):
+	side = ScaleSide(140, scale)
+
+	return "\n".join("".join(rng.choice("XMAS") for _ in range(side)) for _ in range(side)), {}
+
+def GenerateDay05(rng, scale):
+	# All pages are given a fixed order, with a rule for every pair like in the real inputs.
+	pages = rng.sample(range(10, 100), 49)
+
+	rules = [f"{a}|{b}" for i, a in enumerate(pages) for b in pages[i + 1:]]
+	rng.shuffle(rules)
+
+	updates = []
+	for _ in range(200 * scale):
+		update = rng.sample(pages, rng.randrange(2, 12) * 2 + 1)
+
+		# Leave about half the updates correctly ordered.
+		if rng.random() < 0.5:
+			update.sort(key = pages.index)
+
+		updates.append(",".join(str(p) for p in update))
+
+	return "\n".join(rules) + "\n\n" + "\n".join(updates), {}
+
+def GenerateDay06(rng, scale):
+	side = ScaleSide(130, scale)
+
+	grid = [[rng.random() < 0.05 and "#" or "." for _ in range(side)] for _ in range(side)]
+
+	x, y = rng.randrange(side), rng.randrange(side)
+	grid[y][x] = "^"
+
+	return "\n".join("".join(row) for row in grid), {}
+
+def GenerateDay07(rng, scale):
+	lines = []
+
+	for _ in range(850 * scale):
+		# Line lengths are kept a little shorter than the real inputs' worst cases, as those take the
+		# exhaustive search long enough to drown out everything else at larger scales.
+		values = [rng.randrange(1, 1000) for _ in range(rng.randrange(3, 10))]
+
+		# Build the target from a real combination of operators for half of the lines, so that there's
+		# a decent mix of solvable and unsolvable equations.
+		target = values[0]
+		for v in values[1:]:
+			op = rng.choice("+*|")
+			if op == "+":
+				target += v
+			elif op == "*":
+				target *= v
+			else:
+				target = int(f"{target}{v}")
+
+		if rng.random() < 0.5:
+			target += rng.randrange(1, 1000)
+
+		lines.append(f"{target}: {' '.join(str(v) for v in values)}")
+
+	return "\n".join(lines), {}
+
+def GenerateDay08(rng, scale):
+	side = ScaleSide(50, scale)
+	frequencies = string.digits + string.ascii_letters
+
+	grid = [["." for _ in range(side)] for _ in range(side)]
+	for _ in range(200 * scale):
+		grid[rng.randrange(side)][rng.randrange(side)] = rng.choice(frequencies)
+
+	return "\n".join("".join(row) for row in grid), {}
+
+def GenerateDay09(rng, scale):
+	numFiles = 10000 * scale
+
+	# Files are always 1-9 blocks, while the gap after one can be empty.
+	digits = []
+	for _ in range(numFiles):
+		digits.append(str(rng.randrange(1, 10)))
+		digits.append(str(rng.randrange(0, 10)))
+
+	# The last file has no free space declared after it.
+	return "".join(digits[:-1]), {}
+
+def GenerateDay10(rng, scale):
+	side = ScaleSide(50, scale)
+
+	# Pure noise has next to no trails in it, so the terrain is built as a series of ramps (0-9-0)
+	# along each row. Each row's ramps are shifted one step from the last, so that trails can wander
+	# up & down as well.
+	ramp = list(range(10)) + list(range(8, 0, -1))
+
+	rows = []
+	offset = rng.randrange(len(ramp))
+	for _ in range(side):
+		offset += rng.choice([-1, 1])
+		row = [ramp[(x + offset) % len(ramp)] for x in range(side)]
+
+		# Then add a little noise to break some of the trails up.
+		for _ in range(side // 10):
+			row[rng.randrange(side)] = rng.randrange(10)
+
+		rows.append("".join(str(h) for h in row))
+
+	return "\n".join(rows), {}
+
+def GenerateDay11(rng, scale):
+	return " ".join(str(rng.randrange(0, 10000000)) for _ in range(8 * scale)), {}
+
+def GenerateDay13(rng, scale):
+	games = []
+
+	for _ in range(320 * scale):
+		ax, ay, bx, by = (rng.randrange(10, 100) for _ in range(4))
+
+		# Real inputs never have the two buttons moving in the same direction, so neither do these.
+		while ax * by == ay * bx:
+			bx, by = rng.randrange(10, 100), rng.randrange(10, 100)
+
+		# Most games are given a solution with a known number of button presses. The rest are random,
+		# which will almost always be unsolvable.
+		if rng.random() < 0.7:
+			a, b = rng.randrange(1, 100), rng.randrange(1, 100)
+			c, d = ax * a + bx * b, ay * a + by * b
+		else:
+			c, d = rng.randrange(1000, 20000), rng.randrange(1000, 20000)
+
+		games.append(f"Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={c}, Y={d}")
+
+	return "\n\n".join(games), {}
+
+def GenerateDay14(rng, scale):
+	# The grid is scaled along with the robots so that there's still room for each of them to have a
+	# spot of their own. Both sides stay odd-numbered so quadrants are still well-defined.
+	numRobots = 500 * scale
+	factor = isqrt(scale - 1) + 1
+	gridSize = (101 * factor - (factor % 2 == 0), 103 * factor - (factor % 2 == 0))
+
+	# Part 2 needs a frame where every robot is on its own tile, bunched together like a picture would 
+	# be. Pick their positions for that frame first (somewhere in a block around the middle, about 
+	# half full) and then wind back the clock to find where they'd need to start.
+	frame = rng.randrange(1, gridSize[0] * gridSize[1])
+
+	side = isqrt(2 * numRobots) + 1
+	corner = ((gridSize[0] - side) // 2, (gridSize[1] - side) // 2)
+	spots = rng.sample(range(side * side), numRobots)
+
+	robots = []
+	for spot in spots:
+		y, x = divmod(spot, side)
+		x, y = x + corner[0], y + corner[1]
+		vx, vy = rng.randrange(-gridSize[0] + 1, gridSize[0]), rng.randrange(-gridSize[1] + 1, gridSize[1])
+		px, py = (x - vx * frame) % gridSize[0], (y - vy * frame) % gridSize[1]
+
+		robots.append(f"p={px},{py} v={vx},{vy}")
+
+	return "\n".join(robots), {"gridSize": gridSize}
+
+def GenerateDay17(rng, scale):
+	# Follows the shape of the real programs: One loop that consumes 3 bits of A per output.
+	# bst A; bxl k1; cdv B; bxc; bxl k2; adv 3; out B; jnz 0
+	k1, k2 = rng.randrange(8), rng.randrange(8)
+	program = [2, 4, 1, k1, 7, 5, 4, 0, 1, k2, 0, 3, 5, 5, 3, 0]
+
+	a = rng.getrandbits(48 * scale) | (1 << (48 * scale - 1))
+
+	return f"Register A: {a}\nRegister B: 0\nRegister C: 0\n\nProgram: {','.join(str(x) for x in program)}", {}
+
+GENERATORS = {
+	"Day01": GenerateDay01,
+	"Day02": GenerateDay02,
+	"Day03": GenerateDay03,
+	"Day04": GenerateDay04,
+	"Day05": GenerateDay05,
+	"Day06": GenerateDay06,
+	"Day07": GenerateDay07,
+	"Day08": GenerateDay08,
+	"Day09": GenerateDay09,
+	"Day10": GenerateDay10,
+	"Day11": GenerateDay11,
+	"Day13": GenerateDay13,
+	"Day14": GenerateDay14,
+	"Day17": GenerateDay17,
+}
+
+def GenerateInput(day, outputPath, scale = 1, seed = 2024):
+	if day not in GENERATORS:
+		raise Exception(f"No generator available for {day}")
+
+	if scale < 1:
+		raise Exception(f"Scale must be positive: {scale}")
+
+	text, kwargs = GENERATORS[day](random.Random(seed), scale)
+
+	outputDir = os.path.dirname(outputPath)
+	if any(outputDir) and not os.path.isdir(outputDir):
+		os.makedirs(outputDir)
+
+	with open(outputPath, "w") as outFile:
+		outFile.write(text)
+
+	return kwargs
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description = "Generate a synthetic puzzle input for a day.")
+	parser.add_argument("day", choices = sorted(GENERATORS.keys()))
+	parser.add_argument("--scale", type = int, default = 1, help = "Size relative to a real puzzle input.")
+	parser.add_argument("--seed", type = int, default = 2024)
+	parser.add_argument("--output", help = "Defaults to inputs/synthetic/DayNN_xSCALE.txt")
+	args = parser.parse_args()
+
+	outputPath = args.output or f"inputs/synthetic/{args.day}_x{args.scale}.txt"
+	kwargs = GenerateInput(args.day, outputPath, scale = args.scale, seed = args.seed)
+
+	print(f"[{args.day}] Written to {outputPath}" + (any(kwargs) and f", use with {kwargs}" or ""))